@@ -0,0 +1,109 @@
+"""Loopback load test for the multiplayer server.
+
+Starts snake_and_ladder_server.py in a child process and plays many rooms
+against it over a few connections. Each room rolls once per --interval
+seconds (with random phase), and a finished game starts a new one in the
+same room. Reports turn latency percentiles, measured from sending a roll to
+receiving its diff, along with the server's own turn latencies.
+
+    python benchmarks/bench_server.py --rooms 10000 --connections 50 --duration 30
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from snake_and_ladder_server import GameClient  # noqa: E402
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+async def play_room(client, room_id, num_players, interval, deadline, latencies, games):
+    await client.join(room_id, num_players)
+    for _ in range(num_players - 1):
+        await client.join(room_id, num_players)
+
+    # Spread rooms evenly over the interval so rolls arrive at a steady rate
+    await asyncio.sleep(random.uniform(0, interval))
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        diff = await client.roll(room_id)
+        latencies.append(time.perf_counter() - start)
+        if "w" in diff:
+            games.append(diff["t"] + 1)
+            for _ in range(num_players):
+                await client.join(room_id, num_players)
+        await asyncio.sleep(interval)
+
+
+async def run_load(port, rooms, connections, num_players, interval, duration):
+    clients = [await GameClient.connect("127.0.0.1", port) for _ in range(connections)]
+    latencies = []
+    games = []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(
+        play_room(clients[index % connections], f"room-{index}", num_players, interval, deadline,
+                  latencies, games)
+        for index in range(rooms)
+    ))
+    server_stats = await clients[0].stats()
+    for client in clients:
+        client.close()
+    return latencies, games, server_stats
+
+
+def run(rooms=10000, connections=50, num_players=2, interval=1.0, duration=30.0):
+    server = subprocess.Popen([sys.executable, "snake_and_ladder_server.py", "--port", "0"],
+                              cwd=REPO_ROOT, stdout=subprocess.PIPE, text=True)
+    try:
+        port = int(server.stdout.readline().rsplit(":", 1)[1])
+        latencies, games, server_stats = asyncio.run(
+            run_load(port, rooms, connections, num_players, interval, duration))
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies.sort()
+    return {
+        "rooms": rooms,
+        "connections": connections,
+        "turns": len(latencies),
+        "turns_per_sec": len(latencies) / duration,
+        "games_finished": len(games),
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50) * 1000,
+            "p99": percentile(latencies, 0.99) * 1000,
+            "max": latencies[-1] * 1000,
+            "mean": statistics.fmean(latencies) * 1000,
+        },
+        # Request arrival to diff queued, inside the server; excludes the
+        # client and the network, which share the CPU on a loopback run
+        "server_latency_ms": {name: server_stats[name] for name in ("p50_ms", "p99_ms", "max_ms")},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=10000)
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between rolls in a room")
+    parser.add_argument("--duration", type=float, default=30.0)
+    args = parser.parse_args()
+
+    result = run(args.rooms, args.connections, args.players, args.interval, args.duration)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
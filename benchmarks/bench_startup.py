@@ -0,0 +1,86 @@
+"""Startup benchmark: import and initialization cost of the game modules.
+
+Each measurement runs in a fresh interpreter so module caches don't hide the
+real cost. Also checks that importing doesn't initialize SDL or open a window.
+
+    python benchmarks/bench_startup.py --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_RULES = """
+import time
+start = time.perf_counter()
+import snake_and_ladder_rules
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "pygame_imported": "pygame" in sys.modules}))
+"""
+
+IMPORT_GAME = """
+import time
+start = time.perf_counter()
+import snake_and_ladder_modern
+elapsed = time.perf_counter() - start
+import pygame
+print(json.dumps({"seconds": elapsed, "sdl_initialized": pygame.get_init() or pygame.display.get_init()}))
+"""
+
+INIT_GAME = """
+import time
+import snake_and_ladder_modern as game
+start = time.perf_counter()
+game.init()
+game.get_board_texture()
+game.get_dice_textures()
+game.get_font("title")
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed}))
+"""
+
+
+def run_snippet(snippet):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy",
+               PYGAME_HIDE_SUPPORT_PROMPT="1")
+    code = "import json, sys\n" + snippet
+    output = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure(snippet, repeat):
+    runs = [run_snippet(snippet) for _ in range(repeat)]
+    result = dict(runs[-1])
+    result["seconds"] = statistics.median(run["seconds"] for run in runs)
+    return result
+
+
+def run(repeat=5):
+    results = {
+        "import_rules": measure(IMPORT_RULES, repeat),
+        "import_game": measure(IMPORT_GAME, repeat),
+        "init_game": measure(INIT_GAME, repeat),
+    }
+    if results["import_rules"]["pygame_imported"]:
+        raise AssertionError("importing snake_and_ladder_rules pulled in pygame")
+    if results["import_game"]["sdl_initialized"]:
+        raise AssertionError("importing snake_and_ladder_modern initialized SDL")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, result in run(args.repeat).items():
+        print(f"{name}: {result['seconds'] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
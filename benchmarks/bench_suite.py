@@ -0,0 +1,259 @@
+"""Benchmark suite: rendering, startup assets, rules, simulation and result store throughput.
+
+Runs headless with SDL's dummy video driver and writes the results, with
+enough environment info to compare runs, to a JSON file so regressions can
+be tracked across releases.
+
+    python benchmarks/bench_suite.py --output results.json
+    python benchmarks/bench_suite.py --only render rules
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from snake_and_ladder_rules import DEFAULT_BOARD, DICE_SIDES  # noqa: E402
+from snake_and_ladder_sim import np, simulate_games, simulate_games_vectorized  # noqa: E402
+from snake_and_ladder_state import GameStates, PlayerState  # noqa: E402
+from snake_and_ladder_store import ResultStore, simulated_games  # noqa: E402
+
+
+def best_of(function, repeat):
+    """Fastest of repeat calls, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench_render(frames=600, size=None):
+    """Full redraws of the game screen: board, info panel and tokens"""
+    import pygame
+    import snake_and_ladder_modern as game
+
+    if game.screen is None:
+        game.init()
+    size = size or (game.SCREEN_WIDTH, game.SCREEN_HEIGHT)
+    game.screen = pygame.display.set_mode(size)
+    game.set_screen_size(size)
+    board_texture = game.get_board_texture(game.board_geometry.board_size)
+    dice_textures = game.get_dice_textures(game.layout.length(game.DICE_SIZE))
+    players = [game.Player(game.RED, "Player 1", 0), game.Player(game.BLUE, "Player 2", 1)]
+    rng = random.Random(0)
+    positions = [[rng.randint(1, DEFAULT_BOARD.size) for _ in players] for _ in range(frames)]
+
+    def draw_frames(present):
+        for frame in range(frames):
+            for player, position in zip(players, positions[frame]):
+                player.position = position
+            game.screen.fill((220, 240, 255))
+            game.draw_board(game.screen, board_texture)
+            game.draw_info_panel(game.screen, players, frame % len(players), frame % DICE_SIDES + 1,
+                                 dice_textures, game.STATE_PLAYING)
+            for player in players:
+                player.draw(game.screen)
+            if present:
+                pygame.display.flip()
+
+    # The first frame builds the cached board layer and text
+    draw_frames(present=False)
+    draw_seconds = best_of(lambda: draw_frames(present=False), 3)
+    frame_seconds = best_of(lambda: draw_frames(present=True), 3)
+    return {
+        "frames": frames,
+        "resolution": "x".join(map(str, size)),
+        "fps": frames / frame_seconds,
+        "ms_per_frame": frame_seconds / frames * 1000,
+        "draw_fps": frames / draw_seconds,
+    }
+
+
+def bench_render_4k(frames=120):
+    return bench_render(frames, (3840, 2160))
+
+
+def bench_textures(repeat=5):
+    """Cost of building the board and dice textures at startup, fresh and from the disk cache"""
+    import pygame
+    import snake_and_ladder_modern as game
+
+    if game.screen is None:
+        game.init()
+    game.screen = pygame.display.set_mode((game.SCREEN_WIDTH, game.SCREEN_HEIGHT))
+    game.set_screen_size(game.screen.get_size())
+    board_texture = game.create_board_texture()
+
+    def load_all():
+        # Drop the in-memory copies so everything comes from disk
+        game._textures.clear()
+        game._board_layer = None
+        game.draw_board(game.screen, game.get_board_texture())
+        game.get_dice_textures()
+
+    load_all()  # Make sure the disk cache is populated
+    return {
+        "create_board_texture_ms": best_of(game.create_board_texture, repeat) * 1000,
+        "create_dice_textures_ms": best_of(game.create_dice_textures, repeat) * 1000,
+        "create_board_layer_ms": best_of(lambda: game.create_board_layer(board_texture), repeat) * 1000,
+        "load_cached_textures_ms": best_of(load_all, repeat) * 1000,
+    }
+
+
+def bench_rules(moves=1000000):
+    """Raw move resolution, the inner loop of every simulation"""
+    rng = random.Random(0)
+    size = DEFAULT_BOARD.size
+    pairs = [(rng.randrange(size), rng.randint(1, DICE_SIDES)) for _ in range(moves)]
+    resolve_move = DEFAULT_BOARD.resolve_move
+
+    def resolve_all():
+        for position, roll in pairs:
+            resolve_move(position, roll)
+
+    return {"moves_per_sec": moves / best_of(resolve_all, 3)}
+
+
+def bench_simulation(games=50000, vectorized_games=1000000):
+    result = {"games_per_sec": games / best_of(lambda: simulate_games(games, 2, seed=1), 3)}
+    if np is not None:
+        seconds = best_of(lambda: simulate_games_vectorized(vectorized_games, 2, seed=1), 3)
+        result["vectorized_games_per_sec"] = vectorized_games / seconds
+    return result
+
+
+def bench_memory(games=100000, live_games=10000):
+    """Bytes per game of stored results and of live game state in its various forms"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    results = simulate_games(games, 2, seed=1)
+    result_bytes = tracemalloc.get_traced_memory()[0] - before
+
+    # State of live two-player games midway through, as the game holds it
+    import snake_and_ladder_modern as game
+
+    rng = random.Random(0)
+    mean_rolls = int(results.mean_length()) // 2
+    before = tracemalloc.get_traced_memory()[0]
+    live = []
+    for _ in range(live_games):
+        players = [game.Player(game.RED, "Player 1", 0), game.Player(game.BLUE, "Player 2", 1)]
+        for player in players:
+            player.dice_history.extend(rng.randint(1, DICE_SIDES) for _ in range(mean_rolls))
+            player.position = rng.randrange(DEFAULT_BOARD.size)
+        live.append(players)
+    state_bytes = tracemalloc.get_traced_memory()[0] - before
+    del live
+
+    # The same games as bare PlayerStates, as a simulation or server holds them
+    before = tracemalloc.get_traced_memory()[0]
+    live = []
+    for _ in range(live_games):
+        states = [PlayerState(), PlayerState()]
+        for state in states:
+            state.dice_history.extend(rng.randint(1, DICE_SIDES) for _ in range(mean_rolls))
+            state.position = rng.randrange(DEFAULT_BOARD.size)
+        live.append(states)
+    compact_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    return {
+        "result_bytes_per_game": result_bytes / games,
+        "player_state_bytes_per_game": state_bytes / live_games,
+        "compact_state_bytes_per_game": compact_bytes / live_games,
+        "struct_of_arrays_bytes_per_game": GameStates(live_games, 2).nbytes / live_games,
+    }
+
+
+def bench_store(games=20000, batch_size=1000):
+    """Inserting simulated games into a fresh result store, and its statistics queries"""
+    records = list(simulated_games(games, 2, seed=1))
+    with tempfile.TemporaryDirectory() as directory, ResultStore(os.path.join(directory, "results.db")) as store:
+        start = time.perf_counter()
+        for batch in range(0, games, batch_size):
+            store.add_games(records[batch:batch + batch_size])
+        insert_seconds = time.perf_counter() - start
+        rows = store.connection.execute("SELECT COUNT(*) FROM turns").fetchone()[0]
+        return {
+            "games_per_sec": games / insert_seconds,
+            "turn_rows_per_sec": rows / insert_seconds,
+            "square_hits_ms": best_of(lambda: store.square_hits(DEFAULT_BOARD), 3) * 1000,
+            "length_distribution_ms": best_of(lambda: store.length_distribution(DEFAULT_BOARD), 3) * 1000,
+        }
+
+
+BENCHMARKS = {
+    "render": bench_render,
+    "render_4k": bench_render_4k,
+    "textures": bench_textures,
+    "rules": bench_rules,
+    "simulation": bench_simulation,
+    "memory": bench_memory,
+    "store": bench_store,
+}
+
+
+def environment():
+    import pygame
+
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "revision": revision,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "numpy": np.__version__ if np is not None else None,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "video_driver": os.environ["SDL_VIDEODRIVER"],
+    }
+
+
+def run(names=tuple(BENCHMARKS)):
+    results = {"environment": environment()}
+    for name in names:
+        results[name] = BENCHMARKS[name]()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    # Start from an empty texture cache so generation is what gets measured,
+    # and remove it afterwards
+    with tempfile.TemporaryDirectory(prefix="snake_and_ladder_bench_") as cache_dir:
+        os.environ.setdefault("SNAKE_LADDER_TEXTURE_CACHE", cache_dir)
+        results = run(args.only)
+    for name in args.only:
+        values = ", ".join(f"{key}={value:.6g}" if isinstance(value, float) else f"{key}={value}"
+                           for key, value in results[name].items())
+        print(f"{name}: {values}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
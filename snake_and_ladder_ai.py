@@ -0,0 +1,217 @@
+"""Computer players for Snake and Ladder.
+
+In the standard game there is nothing to decide: a bot just rolls. The rule
+variants give it a choice after each roll (which of two dice to use, or
+whether to move at all). For those a bot looks ahead with expectimax:
+decision nodes pick the option best for the player to move, and chance nodes
+average over the dice outcomes of the next turn.
+
+Leaves are scored with the exact expected number of turns each player still
+needs. This assumes every player then follows the best single-player policy,
+which is solved once per (board, variant). A player's score is their lead in
+expected turns over the closest opponent. Searched positions go into a
+bounded transposition table keyed by (positions, turn, depth), so nearby
+states in later turns come back cached.
+"""
+import argparse
+import random
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from snake_and_ladder_rules import (DEFAULT_BOARD, DICE_SIDES, VARIANT_CHOOSE_DIE, VARIANT_STANDARD,
+                                    VARIANTS, Board, load_board, move_options, roll_outcomes)
+
+DEFAULT_DEPTH = 1
+DEFAULT_TABLE_SIZE = 100000
+
+# Value iteration stops once no square's expected turns change by more than this
+CONVERGENCE = 1e-9
+MAX_SWEEPS = 10000
+
+
+def _destination_table(board, outcomes, variant):
+    """table[position][i]: squares reachable from position with the i-th dice outcome"""
+    return [[tuple(destination for _, destination in move_options(board, position, dice, variant))
+             for dice, _ in outcomes]
+            for position in range(board.size)]
+
+
+@lru_cache(maxsize=64)
+def _expected_turns_to_finish(key, variant):
+    board = Board.from_key(key)
+    size = board.size
+    outcomes = roll_outcomes(variant)
+    options = _destination_table(board, outcomes, variant)
+
+    # Gauss-Seidel value iteration from the last square down: most moves go
+    # forward, so this converges in a handful of sweeps
+    turns = [0.0] * (size + 1)
+    for _ in range(MAX_SWEEPS):
+        change = 0.0
+        for position in range(size - 1, -1, -1):
+            value = 1.0
+            for (_, probability), destinations in zip(outcomes, options[position]):
+                value += probability * min(turns[destination] for destination in destinations)
+            change = max(change, abs(value - turns[position]))
+            turns[position] = value
+        if change < CONVERGENCE:
+            break
+    return tuple(turns)
+
+
+def expected_turns_to_finish(board=DEFAULT_BOARD, variant=VARIANT_STANDARD):
+    """Expected turns from every square to the last one, playing the variant optimally"""
+    return _expected_turns_to_finish(board.key(), variant)
+
+
+class TranspositionTable:
+    """LRU cache of searched positions"""
+
+    def __init__(self, maxsize=DEFAULT_TABLE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        return {"size": len(self.entries), "hits": self.hits, "misses": self.misses}
+
+
+class Bot:
+    """A computer player for one board and rule variant"""
+
+    def __init__(self, board=DEFAULT_BOARD, variant=VARIANT_STANDARD, depth=DEFAULT_DEPTH,
+                 table_size=DEFAULT_TABLE_SIZE):
+        if variant not in VARIANTS:
+            raise ValueError(f"unknown variant {variant!r}")
+        self.board = board
+        self.variant = variant
+        self.depth = depth
+        self.outcomes = roll_outcomes(variant)
+        self.probabilities = [probability for _, probability in self.outcomes]
+        self.destinations = _destination_table(board, self.outcomes, variant)
+        self.turns = expected_turns_to_finish(board, variant)
+        self.table = TranspositionTable(table_size)
+
+    def scores(self, positions):
+        """Each player's lead in expected turns over their closest opponent"""
+        turns = [self.turns[position] for position in positions]
+        scores = []
+        for player, own in enumerate(turns):
+            closest = min(turns[:player] + turns[player + 1:], default=0.0)
+            scores.append(closest - own)
+        return scores
+
+    def _child(self, positions, player, destination, depth):
+        child = positions[:player] + (destination,) + positions[player + 1:]
+        if depth == 0 or self.board.is_finished(destination):
+            return self.scores(child)
+        return self.evaluate(child, (player + 1) % len(positions), depth)
+
+    def evaluate(self, positions, turn, depth):
+        """Expected scores of all players when player turn is about to roll"""
+        key = (positions, turn, depth)
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+
+        values = [0.0] * len(positions)
+        for probability, destinations in zip(self.probabilities, self.destinations[positions[turn]]):
+            best = None
+            for destination in destinations:
+                scores = self._child(positions, turn, destination, depth - 1)
+                if best is None or scores[turn] > best[turn]:
+                    best = scores
+            for player, score in enumerate(best):
+                values[player] += probability * score
+
+        self.table.put(key, values)
+        return values
+
+    def choose_move(self, positions, turn, dice):
+        """Number of steps player turn should move after rolling dice; 0 means stay"""
+        positions = tuple(positions)
+        options = move_options(self.board, positions[turn], dice, self.variant)
+        if len(options) == 1:
+            return options[0][0]
+
+        best_steps, best_score = None, None
+        for steps, destination in options:
+            score = self._child(positions, turn, destination, self.depth)[turn]
+            if best_score is None or score > best_score:
+                best_steps, best_score = steps, score
+        return best_steps
+
+
+def roll_dice(rng, variant=VARIANT_STANDARD):
+    count = 2 if variant == VARIANT_CHOOSE_DIE else 1
+    return tuple(rng.randint(1, DICE_SIDES) for _ in range(count))
+
+
+def play_bot_game(bots, rng, board=DEFAULT_BOARD, variant=VARIANT_STANDARD, max_turns=100000):
+    """Play a game between bots (one per seat); returns (winner, turns)"""
+    positions = [0] * len(bots)
+    for turn in range(max_turns):
+        player = turn % len(bots)
+        dice = roll_dice(rng, variant)
+        steps = bots[player].choose_move(positions, player, dice)
+        if steps:
+            positions[player] = board.resolve_move(positions[player], steps)
+        if board.is_finished(positions[player]):
+            return player, turn + 1
+    return None, max_turns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play Snake and Ladder games between bots")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--variant", choices=VARIANTS, default=VARIANT_CHOOSE_DIE)
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--board", help="board config JSON file (default: standard board)")
+    args = parser.parse_args()
+
+    board = load_board(args.board) if args.board else DEFAULT_BOARD
+    rng = random.Random(args.seed)
+    bot = Bot(board, args.variant, args.depth)
+    bots = [bot] * args.players
+
+    wins = [0] * args.players
+    total_turns = 0
+    start = time.perf_counter()
+    for _ in range(args.games):
+        winner, turns = play_bot_game(bots, rng, board, args.variant)
+        wins[winner] += 1
+        total_turns += turns
+    elapsed = time.perf_counter() - start
+
+    print(f"expected turns from start (one player): {bot.turns[0]:.3f}")
+    print(f"mean game length: {total_turns / args.games:.2f} rolls")
+    print(f"win rates: {[count / args.games for count in wins]}")
+    print(f"time per move: {elapsed / total_turns * 1e6:.1f} us")
+    print(f"transposition table: {bot.table.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Exact Snake and Ladder statistics from the board's absorbing Markov chain.
+
+A single token's position after each of its turns is a Markov chain over
+squares 0..size, with the last square absorbing. Solving that chain gives
+the expected number of turns, the full distribution of turns-to-finish and,
+since players move independently, the win probability of each seat for k
+players taking turns in order. No sampling involved.
+
+Requires NumPy.
+"""
+import argparse
+from functools import lru_cache
+
+import numpy as np
+
+from snake_and_ladder_rules import DEFAULT_BOARD, DICE_SIDES, Board, load_board
+
+# Stop extending distributions once the unfinished probability mass is below this
+DEFAULT_TOLERANCE = 1e-12
+MAX_TURNS = 100000
+
+
+def transition_matrix(board=DEFAULT_BOARD):
+    """(size + 1) x (size + 1) matrix of one-turn transition probabilities"""
+    size = board.size
+    matrix = np.zeros((size + 1, size + 1))
+    destinations = np.array(board.move_table[:size])
+    np.add.at(matrix, (np.repeat(np.arange(size), DICE_SIDES), destinations.ravel()), 1 / DICE_SIDES)
+    matrix[size, size] = 1.0
+    return matrix
+
+
+def _read_only(array):
+    array.flags.writeable = False
+    return array
+
+
+@lru_cache(maxsize=256)
+def _transition_matrix(key):
+    return _read_only(transition_matrix(Board.from_key(key)))
+
+
+@lru_cache(maxsize=256)
+def _expected_turns(key):
+    size = key[0]
+    matrix = _transition_matrix(key)
+    transient = matrix[:size, :size]
+
+    # Expected turns to absorption from each transient square: (I - Q) t = 1
+    turns = np.linalg.solve(np.eye(size) - transient, np.ones(size))
+    return float(turns[0])
+
+
+@lru_cache(maxsize=256)
+def _turn_distribution(key, tolerance):
+    size = key[0]
+    matrix = _transition_matrix(key)
+
+    state = np.zeros(size + 1)
+    state[0] = 1.0
+    finished = [0.0]
+    while 1.0 - finished[-1] > tolerance and len(finished) <= MAX_TURNS:
+        state = state @ matrix
+        finished.append(state[size])
+
+    # pmf[t] is the probability of finishing on exactly the t-th turn
+    return _read_only(np.diff(np.array(finished), prepend=0.0))
+
+
+@lru_cache(maxsize=256)
+def _game_distribution(key, num_players, tolerance):
+    pmf = _turn_distribution(key, tolerance)
+    survival = 1.0 - np.cumsum(pmf)  # P(T > t)
+    previous = np.concatenate(([1.0], survival[:-1]))  # P(T > t - 1)
+
+    # Seat i wins on its t-th turn if it finishes then, seats before it have
+    # not finished in t turns and seats after it have not finished in t - 1
+    seat_pmf = np.empty((num_players, len(pmf)))
+    for seat in range(num_players):
+        seat_pmf[seat] = pmf * survival ** seat * previous ** (num_players - 1 - seat)
+
+    # Total rolls when seat i wins on its t-th turn: (t - 1) * k + i + 1
+    length_pmf = np.zeros(len(pmf) * num_players + 1)
+    turns = np.arange(1, len(pmf))
+    for seat in range(num_players):
+        length_pmf[(turns - 1) * num_players + seat + 1] = seat_pmf[seat, 1:]
+
+    win_probabilities = seat_pmf.sum(axis=1)
+    return _read_only(win_probabilities), _read_only(length_pmf)
+
+
+class BoardAnalysis:
+    """Exact statistics of one board config for a given number of players"""
+
+    def __init__(self, board, num_players, tolerance=DEFAULT_TOLERANCE):
+        key = board.key()
+        self.num_players = num_players
+
+        # Turns taken by one player until reaching the last square
+        self.expected_turns = _expected_turns(key)
+        self.turn_distribution = _turn_distribution(key, tolerance)
+
+        # Whole game with num_players taking turns in order
+        self.win_probabilities, self.length_distribution = _game_distribution(
+            key, num_players, tolerance)
+
+    @property
+    def expected_game_length(self):
+        """Expected total dice rolls in a game"""
+        lengths = np.arange(len(self.length_distribution))
+        return float(lengths @ self.length_distribution)
+
+    @property
+    def game_length_stddev(self):
+        lengths = np.arange(len(self.length_distribution))
+        mean = self.expected_game_length
+        return float(((lengths - mean) ** 2) @ self.length_distribution) ** 0.5
+
+    def summary(self):
+        return {
+            "players": self.num_players,
+            "expected_turns": self.expected_turns,
+            "expected_game_length": self.expected_game_length,
+            "stddev_game_length": self.game_length_stddev,
+            "win_probabilities": self.win_probabilities.tolist(),
+        }
+
+
+def analyze_board(board=DEFAULT_BOARD, num_players=2, tolerance=DEFAULT_TOLERANCE):
+    """Solve board exactly; results are memoized per board config"""
+    return BoardAnalysis(board, num_players, tolerance)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact Snake and Ladder statistics")
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--board", help="board config JSON file (default: standard board)")
+    args = parser.parse_args()
+
+    board = load_board(args.board) if args.board else DEFAULT_BOARD
+    for name, value in analyze_board(board, args.players).summary().items():
+        print(f"{name}: {value}")
+
+
+if __name__ == "__main__":
+    main()
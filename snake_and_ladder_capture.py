@@ -0,0 +1,184 @@
+"""Frame capture for recording games.
+
+Rendered frames are copied into a small pool of surfaces and handed to a
+background writer thread through a bounded queue. Rendering only stalls
+when the writer falls a whole queue behind. Two outputs are supported:
+
+- a raw video stream (any path ending in .raw, such as a named pipe read by
+  an encoder), written straight from the surface's pixel buffer without
+  conversion:
+
+      ffmpeg -f rawvideo -pix_fmt bgr0 -s 1024x768 -r 60 -i frames.raw game.mp4
+
+- a PNG sequence, frame-000000.png, frame-000001.png, ... in a directory
+
+Frames that didn't change since the previous one aren't copied at all. The
+writer repeats the last frame (or hard-links the last PNG).
+"""
+import os
+import queue
+import shutil
+import sys
+import threading
+
+import pygame
+
+DEFAULT_QUEUE_SIZE = 8
+
+_STOP = object()
+_REPEAT = object()
+
+
+def ffmpeg_pixel_format(surface):
+    """ffmpeg -pix_fmt name for the surface's in-memory pixel layout, e.g. "bgr0" """
+    if surface.get_bytesize() not in (3, 4):
+        raise ValueError(f"can't stream {surface.get_bitsize()}-bit surfaces")
+    shifts = surface.get_shifts()
+    masks = surface.get_masks()
+    channels = []
+    for byte in range(surface.get_bytesize()):
+        shift = 8 * byte if sys.byteorder == "little" else 8 * (surface.get_bytesize() - 1 - byte)
+        name = "0"
+        for letter, channel_shift, mask in zip("rgba", shifts, masks):
+            if mask and channel_shift == shift:
+                name = letter
+        channels.append(name)
+    return "".join(channels)
+
+
+class RawWriter:
+    """Writes frames as one continuous stream of raw pixels"""
+
+    def __init__(self, path):
+        self.stream = open(path, "wb")
+        self.last = None
+
+    def _pixels(self, frame):
+        # Zero-copy view of the surface's pixels; rows are padded when the
+        # pitch is wider than the visible width
+        view = memoryview(frame.get_buffer())
+        row_bytes = frame.get_width() * frame.get_bytesize()
+        if frame.get_pitch() == row_bytes:
+            return [view]
+        pitch = frame.get_pitch()
+        return [view[y * pitch:y * pitch + row_bytes] for y in range(frame.get_height())]
+
+    def write(self, frame):
+        for chunk in self._pixels(frame):
+            self.stream.write(chunk)
+        self.last = frame
+
+    def repeat(self):
+        self.write(self.last)
+
+    def close(self):
+        self.stream.close()
+
+
+class PngWriter:
+    """Writes frames as a numbered PNG sequence"""
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.index = 0
+        self.last_path = None
+
+    def _next_path(self):
+        path = os.path.join(self.directory, f"frame-{self.index:06d}.png")
+        self.index += 1
+        return path
+
+    def write(self, frame):
+        path = self._next_path()
+        pygame.image.save(frame, path)
+        self.last_path = path
+
+    def repeat(self):
+        path = self._next_path()
+        try:
+            os.link(self.last_path, path)
+        except OSError:
+            shutil.copyfile(self.last_path, path)
+
+    def close(self):
+        pass
+
+
+class FrameCapture:
+    """Hands rendered frames to a writer thread"""
+
+    def __init__(self, writer, template, queue_size=DEFAULT_QUEUE_SIZE):
+        self.writer = writer
+        self.frames = queue.Queue(maxsize=queue_size)
+
+        # One surface per queue slot, plus the one being written and the last
+        # frame kept for repeats
+        self.free = queue.Queue()
+        for _ in range(queue_size + 2):
+            self.free.put(template.copy())
+
+        self.frame_count = 0
+        self.copied = 0
+        self.error = None
+        self.thread = threading.Thread(target=self._run, name="frame-writer", daemon=True)
+        self.thread.start()
+
+    def add_frame(self, surface, changed=True):
+        """Queue the current contents of surface; unchanged frames are only counted"""
+        if self.error is not None:
+            raise RuntimeError("frame writer failed") from self.error
+        if changed or self.frame_count == 0:
+            frame = self.free.get()  # Waits here if the writer is a whole queue behind
+            frame.blit(surface, (0, 0))
+            self.frames.put(frame)
+            self.copied += 1
+        else:
+            self.frames.put(_REPEAT)
+        self.frame_count += 1
+
+    def _run(self):
+        last = None
+        while True:
+            frame = self.frames.get()
+            if frame is _STOP:
+                break
+            if self.error is not None:
+                # Keep draining so add_frame never blocks on a dead writer
+                if frame is not _REPEAT:
+                    self.free.put(frame)
+                continue
+            try:
+                if frame is _REPEAT:
+                    self.writer.repeat()
+                    continue
+                self.writer.write(frame)
+            except Exception as e:
+                self.error = e
+                if frame is not _REPEAT:
+                    self.free.put(frame)
+                continue
+            if last is not None:
+                self.free.put(last)
+            last = frame
+
+    def close(self):
+        """Wait for queued frames to be written and close the output"""
+        self.frames.put(_STOP)
+        self.thread.join()
+        self.writer.close()
+        if self.error is not None:
+            raise RuntimeError("frame writer failed") from self.error
+
+
+def open_capture(path, surface, queue_size=DEFAULT_QUEUE_SIZE):
+    """Capture to a raw stream if path ends in .raw, otherwise to a PNG directory"""
+    if path.endswith(".raw"):
+        writer = RawWriter(path)
+        description = f"raw {ffmpeg_pixel_format(surface)}"
+    else:
+        writer = PngWriter(path)
+        description = "PNG"
+    width, height = surface.get_size()
+    print(f"capturing {width}x{height} {description} frames to {path}", file=sys.stderr)
+    return FrameCapture(writer, surface, queue_size)
@@ -4,18 +4,40 @@ import os
 import random
 import math
 import time
+import csv
+import json
+import hashlib
+import sqlite3
+from collections import OrderedDict, deque
 from pygame import gfxdraw
 
-# Initialize pygame
-pygame.init()
-pygame.mixer.init()
+try:
+    import numpy as np
+except ImportError:
+    # Snake and ladder geometry falls back to plain Python math
+    np = None
+
+from snake_and_ladder_ai import Bot
+from snake_and_ladder_capture import open_capture
+from snake_and_ladder_replay import rolls_from_dice_history, write_replay
+from snake_and_ladder_rules import Board, load_board
+from snake_and_ladder_state import PlayerState
+from snake_and_ladder_store import GameRecord, ResultWriter
 
-# Game constants
+# Game constants. Sizes and positions are for the 1024x768 design layout,
+# which ScreenLayout scales to the actual window
 SCREEN_WIDTH, SCREEN_HEIGHT = 1024, 768
 BOARD_SIZE = 600
 BOARD_GRID = 10  # 10x10 grid
 TILE_SIZE = BOARD_SIZE // BOARD_GRID
+DICE_SIZE = 100
 FPS = 60
+TURBO_FRAME_BUDGET = 0.008  # Seconds of bot turns played per frame in turbo mode
+
+# Initial window size, e.g. SNAKE_LADDER_SIZE=1920x1080, checked by init(); the
+# window can be resized
+WINDOW_SIZE = os.environ.get("SNAKE_LADDER_SIZE", f"{SCREEN_WIDTH}x{SCREEN_HEIGHT}")
+MIN_LAYOUT_SCALE = 0.5  # Smaller windows crop the layout instead of shrinking it further
 
 # Colors
 WHITE = (255, 255, 255)
@@ -29,83 +51,217 @@ ORANGE = (255, 165, 0)
 TEAL = (0, 175, 175)
 PINK = (255, 105, 180)
 
+# Texture themes; SNAKE_LADDER_THEME picks one
+THEMES = {
+    "classic": {
+        "gradient": ((240, 240, 255), (210, 210, 255)),  # Top and bottom of the board background
+        "tiles": ((200, 230, 255), (255, 255, 255)),
+        "tile_border": (100, 100, 100),
+        "numbers": BLACK,
+        "dice": (WHITE, (200, 200, 200), BLACK),  # Body, border and dots
+    },
+    "night": {
+        "gradient": ((40, 44, 70), (20, 22, 40)),
+        "tiles": ((60, 70, 110), (90, 100, 140)),
+        "tile_border": (30, 30, 50),
+        "numbers": WHITE,
+        "dice": ((235, 235, 220), (150, 150, 140), (30, 30, 60)),
+    },
+}
+THEME = os.environ.get("SNAKE_LADDER_THEME", "classic")
+
+# Generated textures are cached on disk here, keyed by size and theme; an
+# empty SNAKE_LADDER_TEXTURE_CACHE turns the cache off
+TEXTURE_CACHE_DIR = os.environ.get(
+    "SNAKE_LADDER_TEXTURE_CACHE",
+    os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "snake_and_ladder"))
+TEXTURE_CACHE_VERSION = 1  # Bump when texture drawing changes
+
+# Window sizes whose textures are saved to the disk cache: the design size,
+# plus the size the game started at (added by init()). Textures for other
+# sizes, e.g. each step of a window drag, are only kept in memory so the
+# cache doesn't grow with every size the window has ever had
+cached_window_sizes = {(SCREEN_WIDTH, SCREEN_HEIGHT)}
+
 # Game states
 STATE_MENU = 0
 STATE_PLAYING = 1
 STATE_GAME_OVER = 2
 
-# Create assets directory if it doesn't exist
-os.makedirs("assets/images", exist_ok=True)
-os.makedirs("assets/sounds", exist_ok=True)
-os.makedirs("assets/fonts", exist_ok=True)
+# Finished games are saved as replays here when set
+REPLAY_DIR = os.environ.get("SNAKE_LADDER_REPLAY_DIR")
 
-# Set up the display
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Snake and Ladder - Modern Edition")
-clock = pygame.time.Clock()
+# Every game, finished or not, is added to this SQLite result store when set
+RESULTS_DB = os.environ.get("SNAKE_LADDER_RESULTS")
 
-# Load fonts
-try:
-    title_font = pygame.font.Font("assets/fonts/Roboto-Bold.ttf", 48)
-    button_font = pygame.font.Font("assets/fonts/Roboto-Bold.ttf", 32)
-    info_font = pygame.font.Font("assets/fonts/Roboto-Medium.ttf", 24)
-    small_font = pygame.font.Font("assets/fonts/Roboto-Regular.ttf", 18)
-except:
-    # Fallback to system fonts if custom fonts not available
-    title_font = pygame.font.SysFont("Arial", 48, bold=True)
-    button_font = pygame.font.SysFont("Arial", 32, bold=True)
-    info_font = pygame.font.SysFont("Arial", 24)
-    small_font = pygame.font.SysFont("Arial", 18)
-
-# Define snakes and ladders
-snakes = {
-    16: 6,
-    47: 26,
-    49: 11,
-    56: 53,
-    62: 19,
-    64: 60,
-    87: 24,
-    93: 73,
-    95: 75,
-    98: 78
-}
+# Number of seats, counted from the last, played by the computer
+NUM_BOTS = int(os.environ.get("SNAKE_LADDER_BOTS", "0"))
+
+# Frame profiler: SNAKE_LADDER_PROFILE=1 turns it on at startup (P toggles it),
+# and a .csv or .json trace of every profiled frame is written on exit when
+# SNAKE_LADDER_PROFILE_TRACE is set
+PROFILE = os.environ.get("SNAKE_LADDER_PROFILE", "0") not in ("", "0")
+PROFILE_TRACE = os.environ.get("SNAKE_LADDER_PROFILE_TRACE")
+
+# Recording: when SNAKE_LADDER_CAPTURE is set, bots play one game offscreen
+# and every frame goes to this PNG directory, or raw stream if it ends in .raw
+CAPTURE = os.environ.get("SNAKE_LADDER_CAPTURE")
+CAPTURE_HOLD_SECONDS = 2  # Keep recording the game over screen this long
 
-ladders = {
-    1: 38,
-    4: 14,
-    9: 31,
-    21: 42,
-    28: 84,
-    36: 44,
-    51: 67,
-    71: 91,
-    80: 100
+# Display and clock, created by init()
+screen = None
+clock = None
+
+# Fonts and textures, loaded on first use
+_fonts = {}
+_font_sources = {}  # Font file each named font was actually loaded from
+_textures = {}
+
+# Font file, design size and boldness of each named font
+FONTS = {
+    "title": ("assets/fonts/Roboto-Bold.ttf", 48, True),
+    "button": ("assets/fonts/Roboto-Bold.ttf", 32, True),
+    "info": ("assets/fonts/Roboto-Medium.ttf", 24, False),
+    "small": ("assets/fonts/Roboto-Regular.ttf", 18, False),
 }
 
+def get_font(name, scale=None):
+    """Return the "title", "button", "info" or "small" font at the layout's scale, loading it on first use"""
+    path, design_size, bold = FONTS[name]
+    size = max(8, round(design_size * (layout.scale if scale is None else scale)))
+    if (name, size) not in _fonts:
+        pygame.font.init()
+        try:
+            font = pygame.font.Font(path, size)
+            source = os.path.abspath(path)
+        except OSError:
+            # Fallback to system fonts if custom fonts not available; None is pygame's default font
+            font = pygame.font.SysFont("Arial", size, bold=bold)
+            source = (pygame.font.match_font("Arial", bold=bold), bold)
+        _fonts[(name, size)] = font
+        _font_sources[name] = source
+    return _fonts[(name, size)]
+
+def get_font_source(name):
+    """The file the named font is loaded from, which depends on what's installed"""
+    if name not in _font_sources:
+        get_font(name)
+    return _font_sources[name]
+
+# LRU cache of rendered text surfaces
+class TextCache:
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        
+    def render(self, font, text, color, antialias=True):
+        """Return a cached font.render() result; callers must not draw onto it"""
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+            
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+        return surface
+        
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.surfaces)}
+        
+    def clear(self):
+        self.surfaces.clear()
+
+text_cache = TextCache()
+
+def render_text(font, text, color, antialias=True):
+    return text_cache.render(font, text, color, antialias)
+
+# Board config (snakes, ladders and the exact-finish rule); init() switches to
+# the JSON file named by SNAKE_LADDER_BOARD if it's set
+BOARD_CONFIG = os.environ.get("SNAKE_LADDER_BOARD")
+game_board = Board()
+
+def get_number_font(tile_size):
+    """Font for tile numbers, sized to the tiles"""
+    return get_font("small", tile_size / TILE_SIZE)
+
+def get_theme(name=None):
+    name = name or THEME
+    if name not in THEMES:
+        raise ValueError(f"unknown theme {name!r}; choose from {', '.join(THEMES)}")
+    return THEMES[name]
+
+def _texture_cache_path(name, key):
+    digest = hashlib.sha1(repr((TEXTURE_CACHE_VERSION, key)).encode()).hexdigest()[:16]
+    return os.path.join(TEXTURE_CACHE_DIR, f"{name}-{digest}.raw")
+
+def load_cached_texture(name, key, size, pixel_format="RGB"):
+    """Load a texture saved by save_cached_texture, or return None"""
+    if not TEXTURE_CACHE_DIR:
+        return None
+    try:
+        with open(_texture_cache_path(name, key), "rb") as f:
+            return pygame.image.frombytes(f.read(), size, pixel_format)
+    except (OSError, ValueError):
+        return None
+
+def should_cache_textures():
+    """Whether textures for the current window size go to the disk cache"""
+    return layout.size in cached_window_sizes
+
+def save_cached_texture(name, key, surface, pixel_format="RGB"):
+    """Save raw pixels, which load much faster than PNG; the cache is best effort"""
+    if not TEXTURE_CACHE_DIR:
+        return
+    path = _texture_cache_path(name, key)
+    try:
+        os.makedirs(TEXTURE_CACHE_DIR, exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            f.write(pygame.image.tobytes(surface, pixel_format))
+        os.replace(path + ".tmp", path)
+    except OSError:
+        pass
+
 # Create game board texture
-def create_board_texture():
-    texture = pygame.Surface((BOARD_SIZE, BOARD_SIZE))
-    texture.fill((240, 240, 255))
+def create_board_texture(size=BOARD_SIZE, theme=None):
+    (top_r, top_g, top_b), (bottom_r, bottom_g, bottom_b) = get_theme(theme)["gradient"]
+    texture = pygame.Surface((size, size))
     
-    # Create a gradient background
-    for y in range(BOARD_SIZE):
-        color_value = 240 - int(y * 30 / BOARD_SIZE)
-        pygame.draw.line(texture, (color_value, color_value, 255), (0, y), (BOARD_SIZE, y))
+    # Vertical gradient, one color per row (int() truncation as in the original line loop)
+    if np is not None:
+        rows = np.arange(size)
+        pixels = pygame.surfarray.pixels3d(texture)
+        for channel, (top, bottom) in enumerate(((top_r, bottom_r), (top_g, bottom_g), (top_b, bottom_b))):
+            pixels[:, :, channel] = (top + np.trunc((bottom - top) * rows / size)).astype(np.uint8)
+        del pixels  # Unlock the surface
+    else:
+        for y in range(size):
+            color = tuple(top + int((bottom - top) * y / size)
+                          for top, bottom in ((top_r, bottom_r), (top_g, bottom_g), (top_b, bottom_b)))
+            pygame.draw.line(texture, color, (0, y), (size, y))
     
     return texture
 
 # Create dice textures
-def create_dice_textures():
-    dice_size = 100
+def create_dice_textures(dice_size=DICE_SIZE, theme=None):
+    body_color, border_color, dot_color = get_theme(theme)["dice"]
     dice_textures = []
+    radius = dice_size * 15 // DICE_SIZE
+    border = max(1, dice_size * 2 // DICE_SIZE)
     
     for value in range(1, 7):
         dice = pygame.Surface((dice_size, dice_size), pygame.SRCALPHA)
         
         # Draw dice body
-        pygame.draw.rect(dice, WHITE, (0, 0, dice_size, dice_size), border_radius=15)
-        pygame.draw.rect(dice, (200, 200, 200), (0, 0, dice_size, dice_size), 2, border_radius=15)
+        pygame.draw.rect(dice, body_color, (0, 0, dice_size, dice_size), border_radius=radius)
+        pygame.draw.rect(dice, border_color, (0, 0, dice_size, dice_size), border, border_radius=radius)
         
         # Draw dots
         dot_positions = {
@@ -122,31 +278,136 @@ def create_dice_textures():
         }
         
         for pos in dot_positions[value]:
-            pygame.draw.circle(dice, BLACK, pos, dice_size//10)
+            pygame.draw.circle(dice, dot_color, pos, dice_size//10)
             
         dice_textures.append(dice)
     
     return dice_textures
 
+def get_board_texture(size=BOARD_SIZE, theme=None):
+    key = ("board", size, theme or THEME)
+    if key not in _textures:
+        texture = load_cached_texture("board", key, (size, size))
+        if texture is None:
+            texture = create_board_texture(size, theme)
+            if should_cache_textures():
+                save_cached_texture("board", key, texture)
+        _textures[key] = texture
+    return _textures[key]
+
+def get_dice_textures(dice_size=DICE_SIZE, theme=None):
+    key = ("dice", dice_size, theme or THEME)
+    if key not in _textures:
+        # All six faces are cached side by side in one strip
+        strip = load_cached_texture("dice", key, (dice_size * 6, dice_size), "RGBA")
+        if strip is None:
+            faces = create_dice_textures(dice_size, theme)
+            strip = pygame.Surface((dice_size * 6, dice_size), pygame.SRCALPHA)
+            for i, face in enumerate(faces):
+                strip.blit(face, (i * dice_size, 0))
+            if should_cache_textures():
+                save_cached_texture("dice", key, strip, "RGBA")
+        else:
+            faces = [strip.subsurface((i * dice_size, 0, dice_size, dice_size)).copy() for i in range(6)]
+        _textures[key] = faces
+    return _textures[key]
+
+# Token sprites, drawn once per (token_type, color, tile size) and then blitted
+TOKEN_SUPERSAMPLE = 4  # Tokens are drawn this much larger, then smoothed down
+TOKEN_SHADOW = (50, 50, 50, 100)
+_token_sprites = {}
+
+def star_points(x, y, size):
+    points = []
+    for i in range(10):
+        angle = math.pi/2 + i * 2*math.pi/10
+        radius = size if i % 2 == 0 else size/2
+        points.append((x + radius * math.cos(angle), y - radius * math.sin(angle)))
+    return points
+
+def diamond_points(x, y, size):
+    return [
+        (x, y - size),
+        (x + size, y),
+        (x, y + size),
+        (x - size, y)
+    ]
+
+def create_token_sprite(token_type, color, tile_size, supersample=TOKEN_SUPERSAMPLE):
+    """A tile-sized token with a translucent drop shadow and anti-aliased edges"""
+    scale = supersample
+    canvas = pygame.Surface((tile_size * scale, tile_size * scale), pygame.SRCALPHA)
+    center = tile_size * scale / 2
+    border = 2 * scale
+    
+    # Shadow offset as in the original 60px tiles, scaled to the tile size
+    shadow = max(1, tile_size // 20) * scale
+    pygame.draw.circle(canvas, TOKEN_SHADOW, (center + shadow, center + shadow), tile_size // 3 * scale)
+    
+    if token_type == 0:  # Circle token
+        radius = tile_size // 3 * scale
+        pygame.draw.circle(canvas, color, (center, center), radius)
+        highlight = tile_size // 12 * scale
+        pygame.draw.circle(canvas, WHITE, (center - highlight, center - highlight), tile_size // 8 * scale)  # Highlight
+        pygame.draw.circle(canvas, BLACK, (center, center), radius, border)  # Border
+    elif token_type in (1, 2):  # Star or diamond token
+        shape = star_points if token_type == 1 else diamond_points
+        points = shape(center, center, tile_size / 2.5 * scale)
+        pygame.draw.polygon(canvas, color, points)
+        pygame.draw.polygon(canvas, BLACK, points, border)
+    
+    if scale == 1:
+        return canvas
+    return pygame.transform.smoothscale(canvas, (tile_size, tile_size))
+
+def get_token_sprite(token_type, color, tile_size):
+    key = (token_type, tuple(color), tile_size)
+    if key not in _token_sprites:
+        sprite = create_token_sprite(token_type, color, tile_size)
+        _token_sprites[key] = sprite.convert_alpha() if pygame.display.get_surface() else sprite
+    return _token_sprites[key]
+
 # Player class
 class Player:
-    def __init__(self, color, name, token_type=0):
-        self.position = 0
+    def __init__(self, color, name, token_type=0, bot=None, state=None):
+        # Game state lives in a compact PlayerState; the rest is for drawing
+        self.state = state if state is not None else PlayerState()
         self.target_position = 0
         self.color = color
         self.name = name
-        self.won = False
-        self.dice_history = []
         self.token_type = token_type
+        self.bot = bot  # Bot that rolls and moves for this player, if computer controlled
         self.animation_progress = 0
-        self.animation_speed = 0.05
+        self.animation_speed = 3.0  # Tiles per second
+        self.speed_multiplier = 1.0
+        self.turbo = False  # Skip interpolation and finish moves instantly
         self.is_animating = False
-        self.path = []
+        self.path = deque()
         self.offset_x = random.randint(-TILE_SIZE//5, TILE_SIZE//5)
         self.offset_y = random.randint(-TILE_SIZE//5, TILE_SIZE//5)
         
+    @property
+    def position(self):
+        return self.state.position
+    
+    @position.setter
+    def position(self, position):
+        self.state.position = position
+        
+    @property
+    def won(self):
+        return self.state.won
+    
+    @won.setter
+    def won(self, won):
+        self.state.won = won
+        
+    @property
+    def dice_history(self):
+        return self.state.dice_history
+        
     def start_move(self, steps):
-        if self.position + steps <= 100:
+        if game_board.can_move(self.position, steps):
             self.target_position = self.position + steps
             self.is_animating = True
             self.animation_progress = 0
@@ -155,328 +416,778 @@ class Player:
         return False
     
     def calculate_path(self, start, end):
-        path = []
-        current = start
-        
         # Add each step to the path
-        while current < end:
-            current += 1
-            path.append(current)
-            
-        return path
+        return deque(range(start + 1, end + 1))
     
-    def update_animation(self):
+    def update_animation(self, dt=1000 / FPS):
+        """Advance the move by dt milliseconds; returns True once the move is complete"""
         if not self.is_animating:
             return False
             
-        self.animation_progress += self.animation_speed
-        
-        if self.animation_progress >= 1:
-            self.animation_progress = 0
+        if self.turbo:
+            return self.finish_move()
             
-            if len(self.path) > 0:
-                self.position = self.path.pop(0)
-                
-                # Check if we've reached the target
-                if len(self.path) == 0:
-                    self.is_animating = False
-                    
-                    # Check for snakes and ladders
-                    if self.position in snakes:
-                        self.start_snake_animation(snakes[self.position])
-                    elif self.position in ladders:
-                        self.start_ladder_animation(ladders[self.position])
-                    
-                    # Check if player won
-                    if self.position == 100:
-                        self.won = True
-                        
-                    return True  # Movement completed
+        self.animation_progress += self.animation_speed * self.speed_multiplier * dt / 1000
+        
+        # A long frame can cover several tiles
+        while self.is_animating and self.animation_progress >= 1:
+            self.animation_progress -= 1
+            if self.step():
+                return True  # Movement completed
             
         return False  # Still animating
     
+    def finish_move(self):
+        """Jump straight to the end of the current move, including snakes and ladders"""
+        while self.is_animating:
+            if self.step():
+                return True
+        return False
+    
+    def step(self):
+        """Move one tile along the path; returns True once the move is complete"""
+        if not self.path:
+            return False
+            
+        self.position = self.path.popleft()
+        
+        # Check if we've reached the target
+        if self.path:
+            return False
+            
+        self.is_animating = False
+        
+        # Check for snakes and ladders; the turn ends once the jump is done
+        if self.position in game_board.snakes:
+            self.start_snake_animation(game_board.snakes[self.position])
+            return False
+        elif self.position in game_board.ladders:
+            self.start_ladder_animation(game_board.ladders[self.position])
+            return False
+        
+        # Check if player won
+        if game_board.is_finished(self.position):
+            self.won = True
+            
+        return True
+    
     def start_snake_animation(self, end_position):
         self.target_position = end_position
         self.is_animating = True
         self.animation_progress = 0
-        self.path = [end_position]  # Direct jump to end position for snake
+        self.path = deque([end_position])  # Direct jump to end position for snake
         
     def start_ladder_animation(self, end_position):
         self.target_position = end_position
         self.is_animating = True
         self.animation_progress = 0
-        self.path = [end_position]  # Direct jump to end position for ladder
+        self.path = deque([end_position])  # Direct jump to end position for ladder
     
-    def draw(self, surface):
+    def draw(self, surface, dirty=None):
         if self.position <= 0:
             return
             
         x, y = get_coordinates(self.position)
+        tile_size = board_geometry.tile_size
         
-        # Add offsets to avoid overlapping
-        x += self.offset_x
-        y += self.offset_y
-        
-        # Draw shadow
-        pygame.draw.circle(surface, (50, 50, 50, 100), (x+3, y+3), TILE_SIZE//3)
-        
-        # Draw token based on type
-        if self.token_type == 0:  # Circle token
-            pygame.draw.circle(surface, self.color, (x, y), TILE_SIZE//3)
-            pygame.draw.circle(surface, WHITE, (x-5, y-5), TILE_SIZE//8)  # Highlight
-            pygame.draw.circle(surface, BLACK, (x, y), TILE_SIZE//3, 2)  # Border
-        elif self.token_type == 1:  # Star token
-            self.draw_star(surface, x, y, TILE_SIZE//2.5, self.color)
-        elif self.token_type == 2:  # Diamond token
-            self.draw_diamond(surface, x, y, TILE_SIZE//2.5, self.color)
-            
-    def draw_star(self, surface, x, y, size, color):
-        points = []
-        for i in range(10):
-            angle = math.pi/2 + i * 2*math.pi/10
-            radius = size if i % 2 == 0 else size/2
-            points.append((x + radius * math.cos(angle), y - radius * math.sin(angle)))
-            
-        pygame.draw.polygon(surface, color, points)
-        pygame.draw.polygon(surface, BLACK, points, 2)
-        
-    def draw_diamond(self, surface, x, y, size, color):
-        points = [
-            (x, y - size),
-            (x + size, y),
-            (x, y + size),
-            (x - size, y)
-        ]
-        pygame.draw.polygon(surface, color, points)
-        pygame.draw.polygon(surface, BLACK, points, 2)
+        # Add offsets to avoid overlapping, scaled to the current tile size
+        x += self.offset_x * tile_size // TILE_SIZE
+        y += self.offset_y * tile_size // TILE_SIZE
+        
+        if dirty is not None:
+            dirty.add(("token", id(self)), self.position, (x - tile_size//2, y - tile_size//2, tile_size, tile_size))
+        
+        # Shadow, body and border come pre-rendered in one sprite
+        sprite = get_token_sprite(self.token_type, self.color, tile_size)
+        surface.blit(sprite, (x - tile_size//2, y - tile_size//2))
 
 # Button class for UI
 class Button:
     def __init__(self, x, y, width, height, text, color, hover_color, text_color=WHITE):
-        self.rect = pygame.Rect(x, y, width, height)
+        self.design_rect = (x, y, width, height)  # In the design layout
+        self.rect = layout.rect(*self.design_rect)
         self.text = text
         self.color = color
         self.hover_color = hover_color
         self.text_color = text_color
         self.is_hovered = False
         
-    def draw(self, surface):
+    def draw(self, surface, dirty=None):
         color = self.hover_color if self.is_hovered else self.color
         
+        if dirty is not None:
+            dirty.add(("button", id(self)), (self.text, self.is_hovered), self.rect)
+        
         # Draw button with rounded corners
-        pygame.draw.rect(surface, color, self.rect, border_radius=10)
-        pygame.draw.rect(surface, BLACK, self.rect, 2, border_radius=10)
+        radius = layout.length(10)
+        pygame.draw.rect(surface, color, self.rect, border_radius=radius)
+        pygame.draw.rect(surface, BLACK, self.rect, layout.length(2), border_radius=radius)
         
         # Draw text
-        text_surf = button_font.render(self.text, True, self.text_color)
+        text_surf = render_text(get_font("button"), self.text, self.text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
         
+    def update_layout(self):
+        """Move and resize the button for the current screen layout"""
+        self.rect = layout.rect(*self.design_rect)
+        
     def update(self, mouse_pos):
         self.is_hovered = self.rect.collidepoint(mouse_pos)
         
     def is_clicked(self, mouse_pos, mouse_click):
         return self.rect.collidepoint(mouse_pos) and mouse_click
 
+# Non-blocking dice roll animation
+class DiceRoll:
+    def __init__(self, duration=1000, face_interval=100):
+        self.duration = duration  # Total roll time in milliseconds
+        self.face_interval = face_interval  # Time each random face is shown
+        self.speed_multiplier = 1.0
+        self.turbo = False  # Roll instantly
+        self.is_rolling = False
+        self.elapsed = 0
+        self.face = 0
+        
+    def start(self):
+        self.is_rolling = True
+        self.elapsed = 0
+        self.face = random.randint(1, 6)
+        
+    def update(self, dt):
+        """Advance the roll by dt milliseconds; returns the rolled value when done, else 0"""
+        if not self.is_rolling:
+            return 0
+            
+        previous_step = self.elapsed // self.face_interval
+        self.elapsed = self.duration if self.turbo else self.elapsed + dt * self.speed_multiplier
+        
+        if self.elapsed >= self.duration:
+            self.is_rolling = False
+            self.face = random.randint(1, 6)
+            return self.face
+            
+        # Show a new random face every face_interval
+        if self.elapsed // self.face_interval != previous_step:
+            self.face = random.randint(1, 6)
+            
+        return 0
+
+def set_animation_speed(players, dice_roll, speed_multiplier, turbo):
+    """Apply the same animation speed settings to all tokens and the dice"""
+    for player in players:
+        player.speed_multiplier = speed_multiplier
+        player.turbo = turbo
+    dice_roll.speed_multiplier = speed_multiplier
+    dice_roll.turbo = turbo
+
+def play_bot_turns(players, current_player, budget):
+    """Play bot turns instantly until a human's turn or budget seconds pass.
+    
+    Used in turbo mode so bot games run many turns per frame rather than one;
+    only the state at the end of the frame gets drawn. A winning move is only
+    started, so the usual animation update finishes it and ends the game.
+    Returns the player to move next and the last roll.
+    """
+    deadline = time.perf_counter() + budget
+    roll = 0
+    while players[current_player].bot is not None:
+        player = players[current_player]
+        roll = random.randint(1, 6)
+        player.dice_history.append(roll)
+        positions = [p.position for p in players]
+        steps = player.bot.choose_move(positions, current_player, (roll,))
+        if steps and player.start_move(steps):
+            if game_board.is_finished(game_board.resolve_move(positions[current_player], steps)):
+                return current_player, roll
+            player.finish_move()
+        current_player = (current_player + 1) % len(players)
+        if time.perf_counter() >= deadline:
+            break
+    return current_player, roll
+
+# Dirty-rectangle tracking for partial display updates
+class DirtyRegions:
+    def __init__(self):
+        self.previous = {}
+        self.current = {}
+        self.full_redraw = True
+        
+    def add(self, key, state, rect):
+        """Record that an element with the given state was drawn in rect this frame"""
+        self.current[key] = (state, pygame.Rect(rect))
+        
+    def invalidate(self):
+        """Force the next frame to present the whole screen"""
+        self.full_redraw = True
+        
+    def end_frame(self, surface):
+        """Return the rects that changed since the previous frame"""
+        if self.full_redraw:
+            rects = [surface.get_rect()]
+        else:
+            rects = []
+            for key, drawn in self.current.items():
+                previous = self.previous.get(key)
+                if previous != drawn:
+                    rects.append(drawn[1])
+                    if previous is not None:
+                        rects.append(previous[1])
+            
+            # Elements that disappeared leave their old area dirty
+            for key, (state, rect) in self.previous.items():
+                if key not in self.current:
+                    rects.append(rect)
+                    
+        self.previous = self.current
+        self.current = {}
+        self.full_redraw = False
+        return rects
+
+# Stages of the main loop timed by the profiler, in loop order
+PROFILE_STAGES = ("events", "update_animation", "clear", "draw_menu", "draw_board", "draw_info_panel",
+                  "Player.draw", "Button.draw", "display")
+
+# Per-stage timings of the main loop with rolling percentiles
+class FrameProfiler:
+    def __init__(self, enabled=False, window=600, refresh_interval=30, trace_path=None):
+        self.enabled = enabled
+        self.refresh_interval = refresh_interval  # Frames between percentile updates
+        self.samples = {stage: deque(maxlen=window) for stage in PROFILE_STAGES + ("frame",)}
+        self.trace_path = trace_path
+        self.trace = []
+        self.frame = 0
+        self.timings = {}
+        self.frame_start = 0.0
+        self.last = 0.0
+        self.percentiles = {}
+        self.version = 0  # Bumped whenever the percentiles change
+        self.overlay = None
+        
+    def toggle(self):
+        self.enabled = not self.enabled
+        
+    def start_frame(self):
+        if self.enabled:
+            self.timings = {}
+            self.frame_start = self.last = time.perf_counter()
+            
+    def lap(self, stage):
+        """Charge the time since the previous lap (or the frame start) to stage"""
+        if self.enabled:
+            now = time.perf_counter()
+            self.timings[stage] = self.timings.get(stage, 0.0) + now - self.last
+            self.last = now
+            
+    def end_frame(self):
+        if not self.enabled or not self.frame_start:
+            return
+        
+        # Work done this frame, not counting the clock.tick() wait
+        self.timings["frame"] = self.last - self.frame_start
+        for stage, seconds in self.timings.items():
+            self.samples[stage].append(seconds)
+        if self.trace_path:
+            self.trace.append(dict(self.timings, index=self.frame))
+        self.frame_start = 0.0
+        
+        self.frame += 1
+        if self.frame % self.refresh_interval == 0:
+            self.update_percentiles()
+            
+    def update_percentiles(self):
+        """p50/p95/p99 in milliseconds of each stage over the rolling window.
+        
+        Stages are only sampled on frames that run them, so idle frames
+        don't dilute the drawing stages.
+        """
+        self.percentiles = {}
+        for stage, samples in self.samples.items():
+            if samples:
+                ordered = sorted(samples)
+                self.percentiles[stage] = tuple(
+                    ordered[min(int(fraction * len(ordered)), len(ordered) - 1)] * 1000
+                    for fraction in (0.50, 0.95, 0.99))
+        self.version += 1
+        self.overlay = None
+        
+    def render_overlay(self):
+        font = get_font("small")
+        rows = [("stage (ms)", "p50", "p95", "p99")]
+        for stage in PROFILE_STAGES + ("frame",):
+            if stage in self.percentiles:
+                rows.append((stage,) + tuple(f"{value:.2f}" for value in self.percentiles[stage]))
+        
+        # Numbers change every refresh, so bypass the text cache
+        cells = [[font.render(text, True, WHITE) for text in row] for row in rows]
+        widths = [max(row[column].get_width() for row in cells) for column in range(4)]
+        line_height = font.get_linesize()
+        padding, gap = 8, 12
+        
+        overlay = pygame.Surface((sum(widths) + gap * 3 + padding * 2, line_height * len(rows) + padding * 2),
+                                 pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 170))
+        for i, row in enumerate(cells):
+            x = padding
+            for column, cell in enumerate(row):
+                # Stage names are left-aligned, numbers right-aligned
+                offset = 0 if column == 0 else widths[column] - cell.get_width()
+                overlay.blit(cell, (x + offset, padding + i * line_height))
+                x += widths[column] + gap
+        return overlay
+        
+    def draw(self, surface, dirty=None):
+        if not self.enabled:
+            return
+        if self.overlay is None:
+            self.overlay = self.render_overlay()
+        rect = surface.blit(self.overlay, (10, surface.get_height() - self.overlay.get_height() - 10))
+        if dirty is not None:
+            dirty.add("profiler", self.version, rect)
+            
+    def dump(self, path=None):
+        """Write the trace as CSV (one row per frame) or JSON, picked by extension"""
+        path = path or self.trace_path
+        columns = ["index", "frame"] + list(PROFILE_STAGES)
+        if path.endswith(".json"):
+            self.update_percentiles()
+            with open(path, "w") as f:
+                json.dump({
+                    "percentiles_ms": {stage: dict(zip(("p50", "p95", "p99"), values))
+                                       for stage, values in self.percentiles.items()},
+                    "frames": self.trace,
+                }, f)
+        else:
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=columns, restval="")
+                writer.writeheader()
+                writer.writerows(self.trace)
+        return path
+
+# Screen layout: the design layout scaled to the window
+class ScreenLayout:
+    """Scales design-layout coordinates (1024x768) to a window of any size.
+    
+    Everything is scaled by the same factor, the largest at which the design
+    layout fits the window, and centered; wider or taller windows get margins.
+    """
+    def __init__(self, size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.size = tuple(size)
+        self.scale = max(min(size[0] / SCREEN_WIDTH, size[1] / SCREEN_HEIGHT), MIN_LAYOUT_SCALE)
+        self.offset_x = (size[0] - SCREEN_WIDTH * self.scale) / 2
+        self.offset_y = (size[1] - SCREEN_HEIGHT * self.scale) / 2
+        
+    def length(self, value):
+        """A design-layout length in pixels; never scaled down to nothing"""
+        return max(1, round(value * self.scale))
+        
+    def point(self, x, y):
+        return (round(self.offset_x + x * self.scale), round(self.offset_y + y * self.scale))
+        
+    def rect(self, x, y, width, height):
+        return pygame.Rect(self.point(x, y), (self.length(width), self.length(height)))
+        
+    def center_x(self, width):
+        """Left edge that centers something width pixels wide on the screen"""
+        return (self.size[0] - width) // 2
+        
+    def board_size(self, grid):
+        """Scaled board size, rounded down so tiles are a whole number of pixels"""
+        return max(grid, round(BOARD_SIZE * self.scale) // grid * grid)
+
+layout = ScreenLayout()
+
+# Board geometry: precomputed mapping between board positions and pixels
+class BoardGeometry:
+    def __init__(self, grid=BOARD_GRID, board_size=BOARD_SIZE, screen_size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.grid = grid
+        self.squares = grid * grid
+        self.board_size = board_size
+        self.screen_size = screen_size
+        self.tile_size = board_size // grid
+        
+        # Calculate board position
+        self.board_x = (screen_size[0] - board_size) // 2
+        self.board_y = (screen_size[1] - board_size) // 2
+        
+        # position -> tile row/col and pixel center; index 0 is off-screen
+        self.rows = [0] * (self.squares + 1)
+        self.cols = [0] * (self.squares + 1)
+        self.centers = [(-100, -100)] * (self.squares + 1)
+        
+        for position in range(1, self.squares + 1):
+            index = position - 1
+            row = grid - 1 - index // grid  # Rows go from bottom to top
+            
+            # Columns alternate direction by row
+            if row % 2 == 1:  # Odd rows go right to left
+                col = grid - 1 - index % grid
+            else:  # Even rows go left to right
+                col = index % grid
+                
+            self.rows[position] = row
+            self.cols[position] = col
+            self.centers[position] = (self.board_x + col * self.tile_size + self.tile_size // 2,
+                                      self.board_y + row * self.tile_size + self.tile_size // 2)
+            
+    def key(self):
+        return (self.grid, self.board_size, self.screen_size)
+        
+    def get_coordinates(self, position):
+        """Screen coordinates of a tile's center; off-screen for position 0"""
+        if 0 < position <= self.squares:
+            return self.centers[position]
+        return (-100, -100)
+
+board_geometry = BoardGeometry(game_board.grid)
+
+def set_board_geometry(grid=BOARD_GRID, board_size=BOARD_SIZE, screen_size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+    """Rebuild the geometry tables, but only if the grid or size actually changed"""
+    global board_geometry
+    if board_geometry.key() != (grid, board_size, screen_size):
+        board_geometry = BoardGeometry(grid, board_size, screen_size)
+    return board_geometry
+
+def set_game_board(board):
+    """Switch to another board config; geometry and the board layer follow it"""
+    global game_board
+    if board.grid is None:
+        raise ValueError(f"board size {board.size} can't be drawn as a square grid")
+    game_board = board
+    return set_board_geometry(board.grid, layout.board_size(board.grid), layout.size)
+
+def set_screen_size(size):
+    """Lay the game out for a new window size.
+    
+    Textures, token sprites and text are rendered for one size, so those
+    caches are dropped and refilled at the new size on first use. The board
+    layer is rebuilt by draw_board once the geometry changes. Only sizes in
+    cached_window_sizes save their textures to disk.
+    """
+    global layout
+    if tuple(size) == layout.size:
+        return layout
+    layout = ScreenLayout(size)
+    _textures.clear()
+    _token_sprites.clear()
+    text_cache.clear()
+    set_board_geometry(game_board.grid, layout.board_size(game_board.grid), layout.size)
+    return layout
+
 # Helper functions
 def get_coordinates(position):
     """Convert board position (1-100) to screen coordinates"""
-    if position <= 0:
-        return (-100, -100)  # Off-screen for position 0
-        
-    # Calculate board position
-    board_x = (SCREEN_WIDTH - BOARD_SIZE) // 2
-    board_y = (SCREEN_HEIGHT - BOARD_SIZE) // 2
+    return board_geometry.get_coordinates(position)
+
+# Snake and ladder shapes
+SNAKE_STEPS = 20
+SNAKE_COLORS = [
+    (
+        int(100 + 155 * ratio),  # R: 100 to 255
+        int(50 + 50 * (1-ratio)),  # G: 100 to 50
+        int(200 - 150 * ratio)   # B: 200 to 50
+    )
+    for ratio in (i / SNAKE_STEPS for i in range(SNAKE_STEPS))
+]
+LADDER_RAIL_SEGMENTS = 9
+LADDER_COLORS = [
+    (
+        int(255 - 100 * t),  # R: 255 to 155
+        int(165 - 65 * t),   # G: 165 to 100
+        int(0 + 100 * t)     # B: 0 to 100
+    )
+    for t in (i / LADDER_RAIL_SEGMENTS for i in range(LADDER_RAIL_SEGMENTS))
+]
+OVERLAY_SUPERSAMPLE = 2  # Snakes and ladders are drawn this much larger, then smoothed down
+
+class JumpGeometry:
+    """Snake polylines and ladder rail/rung endpoints, precomputed once per board.
     
-    # Adjust position to 0-based index
-    position -= 1
+    Coordinates are relative to the board's top-left corner and multiplied by scale.
+    Sizes follow the tile size, so larger grids get thinner snakes and ladders.
+    """
+    def __init__(self, board, geometry, scale=1):
+        unit = geometry.tile_size / TILE_SIZE * scale
+        
+        def local(position):
+            x, y = geometry.get_coordinates(position)
+            return ((x - geometry.board_x) * scale, (y - geometry.board_y) * scale)
+            
+        snake_ends = [(local(start), local(end)) for start, end in board.snakes.items()]
+        ladder_ends = [(local(start), local(end)) for start, end in board.ladders.items()]
+        
+        self.snake_width = max(1, round(8 * unit))
+        self.head_radius = max(2, round(10 * unit))
+        self.eye_offset = max(1, round(3 * unit))
+        self.eye_radius = max(1, round(3 * unit))
+        self.pupil_radius = max(1, round(1 * unit))
+        self.border_width = max(1, round(2 * unit))
+        self.rail_width = max(1, round(5 * unit))
+        self.rung_width = max(1, round(3 * unit))
+        
+        self.snake_heads = [end for start, end in snake_ends]
+        if np is not None:
+            self.snake_bodies = self._snake_bodies_numpy(snake_ends, 15 * unit)
+            self.ladder_rails, self.ladder_rungs = self._ladders_numpy(ladder_ends, 10 * unit, 25 * unit)
+        else:
+            self.snake_bodies = self._snake_bodies_python(snake_ends, 15 * unit)
+            self.ladder_rails, self.ladder_rungs = self._ladders_python(ladder_ends, 10 * unit, 25 * unit)
+            
+    @staticmethod
+    def _snake_bodies_numpy(snake_ends, wave):
+        if not snake_ends:
+            return []
+        ends = np.array(snake_ends, dtype=float)  # (snake, start/end, x/y)
+        t = np.linspace(0, 1, SNAKE_STEPS + 1)
+        start = ends[:, 0, :, None]
+        points = start + (ends[:, 1, :, None] - start) * t  # (snake, x/y, step)
+        
+        # Add some waviness to the snake
+        points[:, 0] += wave * np.sin(t * np.pi * 3)
+        return points.transpose(0, 2, 1).tolist()
+        
+    @staticmethod
+    def _snake_bodies_python(snake_ends, wave):
+        bodies = []
+        for (start_x, start_y), (end_x, end_y) in snake_ends:
+            points = []
+            for i in range(SNAKE_STEPS + 1):
+                t = i / SNAKE_STEPS
+                offset_x = wave * math.sin(t * math.pi * 3)
+                points.append((start_x + (end_x - start_x) * t + offset_x, start_y + (end_y - start_y) * t))
+            bodies.append(points)
+        return bodies
+        
+    @staticmethod
+    def _ladders_numpy(ladder_ends, offset, rung_spacing):
+        if not ladder_ends:
+            return [], []
+        ends = np.array(ladder_ends, dtype=float)  # (ladder, start/end, x/y)
+        delta = ends[:, 1] - ends[:, 0]
+        length = np.hypot(delta[:, 0], delta[:, 1])
+        
+        # Offset of each side, perpendicular to the ladder
+        side = np.stack([-delta[:, 1], delta[:, 0]], axis=1) / length[:, None] * offset
+        sides = np.stack([ends + side[:, None], ends - side[:, None]], axis=1)  # (ladder, side, start/end, x/y)
+        
+        # Rails are drawn as short overlapping segments with a color gradient
+        t = np.arange(LADDER_RAIL_SEGMENTS) / LADDER_RAIL_SEGMENTS
+        rail_start = sides[:, :, 0, None]
+        rail_delta = sides[:, :, 1, None] - rail_start
+        segment_ends = np.stack([rail_start + rail_delta * t[:, None], rail_start + rail_delta * (t + 0.1)[:, None]],
+                                axis=3)  # (ladder, side, segment, start/end, x/y)
+        
+        rungs = []
+        for ladder in range(len(ends)):
+            steps = int(length[ladder] / rung_spacing) + 2
+            ratios = (np.arange(1, steps) / steps)[:, None]
+            side_a, side_b = sides[ladder]
+            rungs.append(np.stack([side_a[0] + (side_a[1] - side_a[0]) * ratios,
+                                   side_b[0] + (side_b[1] - side_b[0]) * ratios], axis=1).tolist())
+        return segment_ends.tolist(), rungs
+        
+    @staticmethod
+    def _ladders_python(ladder_ends, offset, rung_spacing):
+        rails = []
+        rungs = []
+        for (start_x, start_y), (end_x, end_y) in ladder_ends:
+            length = math.hypot(end_x - start_x, end_y - start_y)
+            side_x = -(end_y - start_y) / length * offset
+            side_y = (end_x - start_x) / length * offset
+            sides = [((start_x + side_x, start_y + side_y), (end_x + side_x, end_y + side_y)),
+                     ((start_x - side_x, start_y - side_y), (end_x - side_x, end_y - side_y))]
+            
+            ladder_rails = []
+            for (x1, y1), (x2, y2) in sides:
+                segments = []
+                for i in range(LADDER_RAIL_SEGMENTS):
+                    t = i / LADDER_RAIL_SEGMENTS
+                    segments.append(((x1 + (x2 - x1) * t, y1 + (y2 - y1) * t),
+                                     (x1 + (x2 - x1) * (t + 0.1), y1 + (y2 - y1) * (t + 0.1))))
+                ladder_rails.append(segments)
+            rails.append(ladder_rails)
+            
+            steps = int(length / rung_spacing) + 2
+            (a1, a2), (b1, b2) = sides
+            ladder_rungs = []
+            for i in range(1, steps):
+                ratio = i / steps
+                ladder_rungs.append(((a1[0] + (a2[0] - a1[0]) * ratio, a1[1] + (a2[1] - a1[1]) * ratio),
+                                     (b1[0] + (b2[0] - b1[0]) * ratio, b1[1] + (b2[1] - b1[1]) * ratio)))
+            rungs.append(ladder_rungs)
+        return rails, rungs
+
+def draw_jump_overlay(layer, jumps, supersample=1):
+    """Draw snakes and ladders onto layer, supersampled for anti-aliasing.
     
-    # Calculate row and column
-    row = 9 - (position // 10)  # Rows go from bottom to top
+    The layer is blown up with nearest-neighbour scaling, drawn on, then box-filtered
+    back down, so untouched pixels come back unchanged and edges get smoothed.
+    """
+    width, height = layer.get_size()
+    surface = pygame.transform.scale(layer, (width * supersample, height * supersample)) if supersample > 1 else layer
     
-    # Columns alternate direction by row
-    if row % 2 == 1:  # Odd rows go right to left
-        col = 9 - (position % 10)
-    else:  # Even rows go left to right
-        col = position % 10
+    # Draw snakes
+    for body, (end_x, end_y) in zip(jumps.snake_bodies, jumps.snake_heads):
+        # Draw snake with gradient color
+        for i in range(SNAKE_STEPS):
+            pygame.draw.line(surface, SNAKE_COLORS[i], body[i], body[i+1], jumps.snake_width)
+            
+        # Draw snake head
+        pygame.draw.circle(surface, RED, (end_x, end_y), jumps.head_radius)
+        pygame.draw.circle(surface, BLACK, (end_x, end_y), jumps.head_radius, jumps.border_width)
         
-    # Calculate pixel coordinates (center of tile)
-    x = board_x + col * TILE_SIZE + TILE_SIZE // 2
-    y = board_y + row * TILE_SIZE + TILE_SIZE // 2
-    
-    return (x, y)
+        # Draw eyes
+        eye_y = end_y - jumps.eye_offset
+        for eye_x in (end_x - jumps.eye_offset, end_x + jumps.eye_offset):
+            pygame.draw.circle(surface, WHITE, (eye_x, eye_y), jumps.eye_radius)
+            pygame.draw.circle(surface, BLACK, (eye_x, eye_y), jumps.pupil_radius)
+            
+    # Draw ladders
+    for rails, rungs in zip(jumps.ladder_rails, jumps.ladder_rungs):
+        # Draw ladder sides with gradient
+        for segments in rails:
+            for color, (start, end) in zip(LADDER_COLORS, segments):
+                pygame.draw.line(surface, color, start, end, jumps.rail_width)
+                
+        # Draw ladder rungs
+        for start, end in rungs:
+            pygame.draw.line(surface, (200, 100, 50), start, end, jumps.rung_width)
+            
+    if supersample > 1:
+        layer.blit(pygame.transform.smoothscale(surface, (width, height)), (0, 0))
 
-def draw_board(surface, board_texture):
-    # Calculate board position
-    board_x = (SCREEN_WIDTH - BOARD_SIZE) // 2
-    board_y = (SCREEN_HEIGHT - BOARD_SIZE) // 2
+# Cached static board layer (background, tiles, numbers, snakes and ladders)
+_board_layer = None
+_board_layer_key = None
+
+def create_board_layer(board_texture, theme=None):
+    """Pre-render everything on the board that doesn't change during a game"""
+    layer = board_texture.convert() if pygame.display.get_surface() else board_texture.copy()
+    theme = get_theme(theme)
+    geometry = board_geometry
+    tile_size = geometry.tile_size
+    number_font = get_number_font(tile_size)
+    tile_radius = layout.length(5)
+    tile_border = layout.length(1)
+    
+    # Board position on screen, used to translate into layer coordinates
+    board_x = geometry.board_x
+    board_y = geometry.board_y
     
-    # Draw board background
-    surface.blit(board_texture, (board_x, board_y))
+    def local_coordinates(position):
+        x, y = geometry.get_coordinates(position)
+        return (x - board_x, y - board_y)
     
     # Draw tiles
-    for i in range(1, 101):
-        x, y = get_coordinates(i)
-        row = 9 - ((i-1) // 10)
+    for i in range(1, geometry.squares + 1):
+        x, y = local_coordinates(i)
+        row = geometry.rows[i]
         
         # Calculate tile position
-        tile_x = x - TILE_SIZE // 2
-        tile_y = y - TILE_SIZE // 2
+        tile_x = x - tile_size // 2
+        tile_y = y - tile_size // 2
         
         # Alternate tile colors
         if (row % 2 == 0 and i % 2 == 0) or (row % 2 == 1 and i % 2 == 1):
-            color = (200, 230, 255)
+            color = theme["tiles"][0]
         else:
-            color = (255, 255, 255)
+            color = theme["tiles"][1]
             
         # Draw tile with rounded corners
-        pygame.draw.rect(surface, color, (tile_x, tile_y, TILE_SIZE, TILE_SIZE), border_radius=5)
-        pygame.draw.rect(surface, (100, 100, 100), (tile_x, tile_y, TILE_SIZE, TILE_SIZE), 1, border_radius=5)
+        pygame.draw.rect(layer, color, (tile_x, tile_y, tile_size, tile_size), border_radius=tile_radius)
+        pygame.draw.rect(layer, theme["tile_border"], (tile_x, tile_y, tile_size, tile_size), tile_border,
+                         border_radius=tile_radius)
         
         # Draw number
-        number_text = small_font.render(str(i), True, BLACK)
-        surface.blit(number_text, (x - number_text.get_width()//2, y - number_text.get_height()//2))
+        number_text = render_text(number_font, str(i), theme["numbers"])
+        layer.blit(number_text, (x - number_text.get_width()//2, y - number_text.get_height()//2))
     
-    # Draw snakes
-    for start, end in snakes.items():
-        start_x, start_y = get_coordinates(start)
-        end_x, end_y = get_coordinates(end)
-        
-        # Draw snake body with curve
-        points = []
-        steps = 20
-        for i in range(steps + 1):
-            t = i / steps
-            # Add some waviness to the snake
-            offset_x = 15 * math.sin(t * math.pi * 3)
-            x = start_x + (end_x - start_x) * t + offset_x
-            y = start_y + (end_y - start_y) * t
-            points.append((x, y))
-        
-        # Draw snake body
-        if len(points) > 1:
-            # Draw snake with gradient color
-            for i in range(len(points)-1):
-                ratio = i / (len(points)-1)
-                color = (
-                    int(100 + 155 * ratio),  # R: 100 to 255
-                    int(50 + 50 * (1-ratio)),  # G: 100 to 50
-                    int(200 - 150 * ratio)   # B: 200 to 50
-                )
-                pygame.draw.line(surface, color, points[i], points[i+1], 8)
-        
-        # Draw snake head
-        pygame.draw.circle(surface, RED, (end_x, end_y), 10)
-        pygame.draw.circle(surface, BLACK, (end_x, end_y), 10, 2)
-        
-        # Draw eyes
-        pygame.draw.circle(surface, WHITE, (end_x-3, end_y-3), 3)
-        pygame.draw.circle(surface, WHITE, (end_x+3, end_y-3), 3)
-        pygame.draw.circle(surface, BLACK, (end_x-3, end_y-3), 1)
-        pygame.draw.circle(surface, BLACK, (end_x+3, end_y-3), 1)
+    # Draw snakes and ladders on an anti-aliased overlay
+    draw_jump_overlay(layer, JumpGeometry(game_board, geometry, OVERLAY_SUPERSAMPLE), OVERLAY_SUPERSAMPLE)
     
-    # Draw ladders
-    for start, end in ladders.items():
-        start_x, start_y = get_coordinates(start)
-        end_x, end_y = get_coordinates(end)
-        
-        # Calculate ladder sides
-        angle = math.atan2(end_y - start_y, end_x - start_x)
-        perpendicular = angle + math.pi/2
-        offset = 10
-        
-        x1_start = start_x + offset * math.cos(perpendicular)
-        y1_start = start_y + offset * math.sin(perpendicular)
-        x1_end = end_x + offset * math.cos(perpendicular)
-        y1_end = end_y + offset * math.sin(perpendicular)
-        
-        x2_start = start_x - offset * math.cos(perpendicular)
-        y2_start = start_y - offset * math.sin(perpendicular)
-        x2_end = end_x - offset * math.cos(perpendicular)
-        y2_end = end_y - offset * math.sin(perpendicular)
-        
-        # Draw ladder sides with gradient
-        for i in range(10):
-            t = i / 9
-            color = (
-                int(255 - 100 * t),  # R: 255 to 155
-                int(165 - 65 * t),   # G: 165 to 100
-                int(0 + 100 * t)     # B: 0 to 100
-            )
-            
-            x1 = x1_start + (x1_end - x1_start) * t
-            y1 = y1_start + (y1_end - y1_start) * t
-            x2 = x1_start + (x1_end - x1_start) * (t + 0.1)
-            y2 = y1_start + (y1_end - y1_start) * (t + 0.1)
-            
-            if t < 0.9:
-                pygame.draw.line(surface, color, (x1, y1), (x2, y2), 5)
-                
-            x1 = x2_start + (x2_end - x2_start) * t
-            y1 = y2_start + (y2_end - y2_start) * t
-            x2 = x2_start + (x2_end - x2_start) * (t + 0.1)
-            y2 = y2_start + (y2_end - y2_start) * (t + 0.1)
-            
-            if t < 0.9:
-                pygame.draw.line(surface, color, (x1, y1), (x2, y2), 5)
-        
-        # Draw ladder rungs
-        dist = ((end_x - start_x)**2 + (end_y - start_y)**2)**0.5
-        steps = int(dist / 25) + 2
-        for i in range(1, steps):
-            ratio = i / steps
-            x1 = x1_start + (x1_end - x1_start) * ratio
-            y1 = y1_start + (y1_end - y1_start) * ratio
-            x2 = x2_start + (x2_end - x2_start) * ratio
-            y2 = y2_start + (y2_end - y2_start) * ratio
-            pygame.draw.line(surface, (200, 100, 50), (x1, y1), (x2, y2), 3)
-
-def draw_info_panel(surface, players, current_player, dice_value, dice_textures, game_state):
+    return layer
+
+def draw_board(surface, board_texture):
+    global _board_layer, _board_layer_key
+    
+    # Rebuild the static layer only when the board config or resolution changes
+    key = (board_texture, game_board.key(), board_geometry.key(), surface.get_size())
+    if _board_layer is None or key != _board_layer_key:
+        # On disk, the texture is identified by its size and the theme and font it was made with
+        disk_key = (THEME, get_font_source("small"), board_texture.get_size(), game_board.key(),
+                    board_geometry.key())
+        layer = load_cached_texture("layer", disk_key, board_texture.get_size())
+        if layer is None:
+            layer = create_board_layer(board_texture)
+            if should_cache_textures():
+                save_cached_texture("layer", disk_key, layer)
+        elif pygame.display.get_surface():
+            layer = layer.convert()
+        _board_layer = layer
+        _board_layer_key = key
+    
+    # Draw board layer
+    surface.blit(_board_layer, (board_geometry.board_x, board_geometry.board_y))
+
+def draw_info_panel(surface, players, current_player, dice_value, dice_textures, game_state, dice_rolling=False, dirty=None):
     # Draw player information
     for i, player in enumerate(players):
         y_pos = 100 + i * 120
         
         # Player panel
-        panel_rect = pygame.Rect(50, y_pos, 200, 100)
-        pygame.draw.rect(surface, player.color, panel_rect, border_radius=15)
-        pygame.draw.rect(surface, BLACK, panel_rect, 2, border_radius=15)
+        panel_rect = layout.rect(50, y_pos, 200, 100)
+        pygame.draw.rect(surface, player.color, panel_rect, border_radius=layout.length(15))
+        pygame.draw.rect(surface, BLACK, panel_rect, layout.length(2), border_radius=layout.length(15))
         
         # Highlight current player
-        if game_state == STATE_PLAYING and i == current_player and not player.is_animating:
-            pygame.draw.rect(surface, WHITE, panel_rect.inflate(10, 10), 3, border_radius=20)
+        highlighted = game_state == STATE_PLAYING and i == current_player and not player.is_animating and not dice_rolling
+        if highlighted:
+            pygame.draw.rect(surface, WHITE, panel_rect.inflate(layout.length(10), layout.length(10)),
+                             layout.length(3), border_radius=layout.length(20))
+            
+        if dirty is not None:
+            dirty.add(("panel", i), (player.name, player.position, highlighted),
+                      panel_rect.inflate(layout.length(14), layout.length(14)))
         
         # Player name
-        name_text = info_font.render(player.name, True, WHITE)
-        surface.blit(name_text, (panel_rect.centerx - name_text.get_width()//2, panel_rect.y + 15))
+        name_text = render_text(get_font("info"), player.name, WHITE)
+        surface.blit(name_text, (panel_rect.centerx - name_text.get_width()//2, panel_rect.y + layout.length(15)))
         
         # Player position
-        pos_text = title_font.render(str(player.position), True, WHITE)
-        surface.blit(pos_text, (panel_rect.centerx - pos_text.get_width()//2, panel_rect.y + 45))
+        pos_text = render_text(get_font("title"), str(player.position), WHITE)
+        surface.blit(pos_text, (panel_rect.centerx - pos_text.get_width()//2, panel_rect.y + layout.length(45)))
     
     # Draw dice
     if dice_value > 0 and dice_value <= 6:
-        dice_x = SCREEN_WIDTH - 150
-        dice_y = SCREEN_HEIGHT // 2 - 50
+        dice_x, dice_y = layout.point(SCREEN_WIDTH - 150, SCREEN_HEIGHT // 2 - 50)
         surface.blit(dice_textures[dice_value-1], (dice_x, dice_y))
+        
+        if dirty is not None:
+            dirty.add("dice", dice_value, dice_textures[dice_value-1].get_rect(topleft=(dice_x, dice_y)))
     
     # Draw game instructions
     if game_state == STATE_PLAYING:
-        if not players[current_player].is_animating:
-            instruction = info_font.render("Press SPACE to roll dice", True, BLACK)
-            surface.blit(instruction, (SCREEN_WIDTH//2 - instruction.get_width()//2, SCREEN_HEIGHT - 50))
+        if not players[current_player].is_animating and not dice_rolling:
+            instruction = render_text(get_font("info"), "Press SPACE to roll dice", BLACK)
+            instruction_rect = surface.blit(instruction, (layout.center_x(instruction.get_width()),
+                                                          layout.point(0, SCREEN_HEIGHT - 50)[1]))
+            if dirty is not None:
+                dirty.add("instruction", "roll", instruction_rect)
     elif game_state == STATE_GAME_OVER:
         for player in players:
             if player.won:
-                winner_text = title_font.render(f"{player.name} Wins!", True, player.color)
-                surface.blit(winner_text, (SCREEN_WIDTH//2 - winner_text.get_width()//2, 50))
+                winner_text = render_text(get_font("title"), f"{player.name} Wins!", player.color)
+                winner_rect = surface.blit(winner_text, (layout.center_x(winner_text.get_width()), layout.point(0, 50)[1]))
+                if dirty is not None:
+                    dirty.add("winner", player.name, winner_rect)
 
 def draw_menu(surface):
     # Draw title
-    title_text = title_font.render("Snake and Ladder", True, PURPLE)
-    surface.blit(title_text, (SCREEN_WIDTH//2 - title_text.get_width()//2, 150))
+    title_text = render_text(get_font("title"), "Snake and Ladder", PURPLE)
+    surface.blit(title_text, (layout.center_x(title_text.get_width()), layout.point(0, 150)[1]))
     
-    subtitle_text = info_font.render("Modern Edition", True, ORANGE)
-    surface.blit(subtitle_text, (SCREEN_WIDTH//2 - subtitle_text.get_width()//2, 210))
+    subtitle_text = render_text(get_font("info"), "Modern Edition", ORANGE)
+    surface.blit(subtitle_text, (layout.center_x(subtitle_text.get_width()), layout.point(0, 210)[1]))
     
     # Draw animated snake
     current_time = pygame.time.get_ticks() / 1000
@@ -490,49 +1201,109 @@ def draw_menu(surface):
             int(50 + 50 * (i/20)),
             int(200 - 150 * (1-i/20))
         )
-        pygame.draw.circle(surface, color, (x, y), size)
+        pygame.draw.circle(surface, color, layout.point(x, y), size * layout.scale)
     
     # Draw animated ladder
     ladder_x = SCREEN_WIDTH//2 - 100
     ladder_y = 400
+    width = layout.length(5)
     for i in range(5):
         rung_y = ladder_y + i * 30
-        pygame.draw.line(surface, ORANGE, (ladder_x, rung_y), (ladder_x + 200, rung_y), 5)
-    pygame.draw.line(surface, ORANGE, (ladder_x, ladder_y), (ladder_x, ladder_y + 120), 5)
-    pygame.draw.line(surface, ORANGE, (ladder_x + 200, ladder_y), (ladder_x + 200, ladder_y + 120), 5)
+        pygame.draw.line(surface, ORANGE, layout.point(ladder_x, rung_y), layout.point(ladder_x + 200, rung_y), width)
+    pygame.draw.line(surface, ORANGE, layout.point(ladder_x, ladder_y), layout.point(ladder_x, ladder_y + 120), width)
+    pygame.draw.line(surface, ORANGE, layout.point(ladder_x + 200, ladder_y),
+                     layout.point(ladder_x + 200, ladder_y + 120), width)
 
-def roll_dice_animation(surface, board_texture, players, dice_textures):
-    for _ in range(10):
-        value = random.randint(1, 6)
-        
-        # Clear screen
-        surface.fill((220, 240, 255))
-        
-        # Draw board and players
-        draw_board(surface, board_texture)
-        for player in players:
-            player.draw(surface)
-        
-        # Draw dice
-        dice_x = SCREEN_WIDTH - 150
-        dice_y = SCREEN_HEIGHT // 2 - 50
-        surface.blit(dice_textures[value-1], (dice_x, dice_y))
-        
-        pygame.display.flip()
-        pygame.time.delay(100)
+def save_replay(players):
+    """Save the finished game's rolls to REPLAY_DIR and return the path.
     
-    return random.randint(1, 6)
+    If it can't be written, prints a warning, turns replay saving off for
+    the rest of the session and returns None; the game carries on.
+    """
+    global REPLAY_DIR
+    name = time.strftime("replay-%Y%m%d-%H%M%S")
+    rolls = rolls_from_dice_history([player.dice_history for player in players])
+    try:
+        os.makedirs(REPLAY_DIR, exist_ok=True)
+        # Games can end within the same second, especially bots in turbo mode
+        count = 0
+        while True:
+            path = os.path.join(REPLAY_DIR, f"{name}-{count}.ndjson" if count else f"{name}.ndjson")
+            try:
+                write_replay(path, rolls, len(players), game_board, exclusive=True)
+                return path
+            except FileExistsError:
+                count += 1
+    except OSError as e:
+        print(f"warning: can't save replays to {REPLAY_DIR}, no longer saving them: {e}", file=sys.stderr)
+        REPLAY_DIR = None
+        return None
+
+def record_result(results, players):
+    """Queue the game's rolls for the result store; written on a background thread"""
+    rolls = rolls_from_dice_history([player.dice_history for player in players])
+    results.submit(GameRecord(game_board, rolls, names=[player.name for player in players]))
+
+def parse_window_size(value):
+    """(width, height) from a size like "1920x1080" """
+    try:
+        width, height = (int(n) for n in value.lower().split("x"))
+    except ValueError:
+        raise ValueError(f"window size must look like 1920x1080, not {value!r}") from None
+    if width <= 0 or height <= 0:
+        raise ValueError(f"window size must be positive, not {value!r}")
+    return width, height
+
+def init():
+    """Start pygame and open the game window; importing this module doesn't"""
+    global screen, clock
+    window_size = parse_window_size(WINDOW_SIZE)
+    
+    # Recordings render offscreen and silently
+    if CAPTURE:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    
+    # Initialize pygame
+    pygame.init()
+    pygame.mixer.init()
+    
+    # Set up the display; recordings keep one size throughout
+    screen = pygame.display.set_mode(window_size, 0 if CAPTURE else pygame.RESIZABLE)
+    pygame.display.set_caption("Snake and Ladder - Modern Edition")
+    clock = pygame.time.Clock()
+    cached_window_sizes.add(screen.get_size())
+    set_screen_size(screen.get_size())
+    
+    if BOARD_CONFIG:
+        set_game_board(load_board(BOARD_CONFIG))
+    return screen
 
 def main():
+    # Fail before opening the window rather than at the end of the first game
+    try:
+        results = ResultWriter(RESULTS_DB) if RESULTS_DB else None
+    except (sqlite3.Error, ValueError) as e:
+        sys.exit(f"can't open result store {RESULTS_DB}: {e}")
+    
+    init()
+    
     # Create game assets
-    board_texture = create_board_texture()
-    dice_textures = create_dice_textures()
+    board_texture = get_board_texture(board_geometry.board_size)
+    dice_textures = get_dice_textures(layout.length(DICE_SIZE))
     
     # Create players
     players = [
         Player(RED, "Player 1", 0),
         Player(BLUE, "Player 2", 1)
     ]
+    # Recordings have nobody at the keyboard, so bots take every seat by default
+    num_bots = NUM_BOTS or (len(players) if CAPTURE else 0)
+    if num_bots:
+        bot = Bot(game_board)
+        for player in players[-num_bots:]:
+            player.bot = bot
+            player.name += " (Bot)"
     
     # Create buttons
     play_button = Button(SCREEN_WIDTH//2 - 100, 500, 200, 60, "Play Game", GREEN, (100, 255, 100))
@@ -542,41 +1313,88 @@ def main():
     # Game variables
     current_player = 0
     dice_value = 0
+    dice_roll = DiceRoll()
     game_state = STATE_MENU
+    dt = 0
+    
+    # Recordings skip the menu and run on game time rather than the wall clock
+    capture = open_capture(CAPTURE, screen) if CAPTURE else None
+    if capture is not None:
+        game_state = STATE_PLAYING
+    capture_hold = CAPTURE_HOLD_SECONDS * FPS
+    
+    # Whether the current game has been sent to the result store writer
+    result_recorded = False
+    
+    # Animation speed: +/- change the speed, T toggles turbo mode
+    speed_multiplier = 1.0
+    turbo = False
+    
+    # Rendering state: only changed regions are pushed to the display
+    profiler = FrameProfiler(PROFILE, trace_path=PROFILE_TRACE)
+    dirty = DirtyRegions()
+    drawn_game_state = None
+    last_frame_state = None
     
     # Main game loop
     running = True
     while running:
+        profiler.start_frame()
+        
         # Handle events
         mouse_pos = pygame.mouse.get_pos()
         mouse_clicked = False
+        window_size = None
         
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.VIDEOEXPOSE:
+                dirty.invalidate()
+            elif event.type == pygame.VIDEORESIZE:
+                window_size = event.size  # Only the last size of a drag matters
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Left mouse button
                     mouse_clicked = True
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE and game_state == STATE_PLAYING:
-                    if not players[current_player].is_animating:
-                        dice_value = roll_dice_animation(screen, board_texture, players, dice_textures)
-                        players[current_player].dice_history.append(dice_value)
-                        players[current_player].start_move(dice_value)
+                    if not players[current_player].is_animating and not dice_roll.is_rolling:
+                        dice_roll.start()
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    speed_multiplier = min(speed_multiplier * 2, 64.0)
+                    set_animation_speed(players, dice_roll, speed_multiplier, turbo)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    speed_multiplier = max(speed_multiplier / 2, 0.25)
+                    set_animation_speed(players, dice_roll, speed_multiplier, turbo)
+                elif event.key == pygame.K_t:
+                    turbo = not turbo
+                    set_animation_speed(players, dice_roll, speed_multiplier, turbo)
+                elif event.key == pygame.K_p:
+                    profiler.toggle()
                 elif event.key == pygame.K_r and game_state == STATE_GAME_OVER:
                     # Reset game
                     for player in players:
-                        player.position = 0
+                        player.state.reset()
                         player.target_position = 0
-                        player.won = False
-                        player.dice_history = []
                         player.is_animating = False
                     current_player = 0
                     dice_value = 0
+                    dice_roll.is_rolling = False
+                    result_recorded = False
                     game_state = STATE_PLAYING
         
-        # Clear screen
-        screen.fill((220, 240, 255))
+        
+        # Re-render everything static once for the new size rather than scaling every frame
+        if window_size is not None and window_size != layout.size:
+            set_screen_size(window_size)
+            board_texture = get_board_texture(board_geometry.board_size)
+            dice_textures = get_dice_textures(layout.length(DICE_SIZE))
+            for button in (play_button, quit_button, menu_button):
+                button.update_layout()
+            profiler.overlay = None
+            dirty.invalidate()
+        
+        profiler.lap("events")
         
         # Update game state
         if game_state == STATE_MENU:
@@ -590,49 +1408,136 @@ def main():
             elif quit_button.is_clicked(mouse_pos, mouse_clicked):
                 running = False
                 
-            # Draw menu
-            draw_menu(screen)
-            play_button.draw(screen)
-            quit_button.draw(screen)
-            
         elif game_state == STATE_PLAYING or game_state == STATE_GAME_OVER:
             # Update menu button
             menu_button.update(mouse_pos)
             if menu_button.is_clicked(mouse_pos, mouse_clicked):
                 game_state = STATE_MENU
             
+            # Computer players roll as soon as it's their turn; in turbo mode they
+            # play as many turns as fit in the frame
+            if (game_state == STATE_PLAYING and players[current_player].bot is not None
+                    and not players[current_player].is_animating and not dice_roll.is_rolling):
+                if turbo:
+                    current_player, dice_value = play_bot_turns(players, current_player, TURBO_FRAME_BUDGET)
+                else:
+                    dice_roll.start()
+            
+            # Update dice roll
+            if game_state == STATE_PLAYING and dice_roll.is_rolling:
+                rolled_value = dice_roll.update(dt)
+                dice_value = dice_roll.face
+                
+                if rolled_value:
+                    player = players[current_player]
+                    player.dice_history.append(rolled_value)
+                    steps = rolled_value
+                    if player.bot is not None:
+                        positions = [p.position for p in players]
+                        steps = player.bot.choose_move(positions, current_player, (rolled_value,))
+                    if not steps or not player.start_move(steps):
+                        # Overshooting the last square forfeits the move
+                        current_player = (current_player + 1) % len(players)
+            
             # Update player animation
             if game_state == STATE_PLAYING and players[current_player].is_animating:
-                movement_completed = players[current_player].update_animation()
+                movement_completed = players[current_player].update_animation(dt)
                 
                 if movement_completed:
                     # Check if player won
                     if players[current_player].won:
                         game_state = STATE_GAME_OVER
+                        if REPLAY_DIR:
+                            save_replay(players)
+                        if results is not None:
+                            record_result(results, players)
+                            result_recorded = True
                     else:
                         # Switch to next player
                         current_player = (current_player + 1) % len(players)
             
-            # Draw game elements
-            draw_board(screen, board_texture)
-            draw_info_panel(screen, players, current_player, dice_value, dice_textures, game_state)
+        profiler.lap("update_animation")
+        
+        # Present the whole screen after switching between menu and game
+        if game_state != drawn_game_state:
+            dirty.invalidate()
+            drawn_game_state = game_state
+        
+        # Nothing to draw or present on idle frames
+        frame_state = (game_state, current_player, dice_value, dice_roll.is_rolling, menu_button.is_hovered,
+                       tuple((player.position, player.is_animating) for player in players),
+                       profiler.enabled, profiler.version)
+        redrawn = game_state == STATE_MENU or dirty.full_redraw or frame_state != last_frame_state
+        if redrawn:
+            last_frame_state = frame_state
+            
+            # Clear screen
+            screen.fill((220, 240, 255))
+            profiler.lap("clear")
             
-            # Draw players
-            for player in players:
-                player.draw(screen)
+            if game_state == STATE_MENU:
+                # Draw menu; it's animated, so the whole screen changes every frame
+                draw_menu(screen)
+                profiler.lap("draw_menu")
+                play_button.draw(screen)
+                quit_button.draw(screen)
+                profiler.lap("Button.draw")
+                dirty.invalidate()
+            else:
+                # Draw game elements
+                draw_board(screen, board_texture)
+                profiler.lap("draw_board")
+                draw_info_panel(screen, players, current_player, dice_value, dice_textures, game_state,
+                                dice_roll.is_rolling, dirty)
+                profiler.lap("draw_info_panel")
                 
-            # Draw menu button
-            menu_button.draw(screen)
+                # Draw players
+                for player in players:
+                    player.draw(screen, dirty)
+                profiler.lap("Player.draw")
+                    
+                # Draw menu button
+                menu_button.draw(screen, dirty)
+                profiler.lap("Button.draw")
+                
+                # Draw game over message
+                if game_state == STATE_GAME_OVER:
+                    restart_text = render_text(get_font("info"), "Press R to play again", BLACK)
+                    screen.blit(restart_text, (layout.center_x(restart_text.get_width()),
+                                               layout.point(0, SCREEN_HEIGHT - 50)[1]))
+                    profiler.lap("draw_info_panel")
             
-            # Draw game over message
-            if game_state == STATE_GAME_OVER:
-                restart_text = info_font.render("Press R to play again", True, BLACK)
-                screen.blit(restart_text, (SCREEN_WIDTH//2 - restart_text.get_width()//2, SCREEN_HEIGHT - 50))
+            # The overlay's own drawing is charged to the display stage
+            profiler.draw(screen, dirty)
+            
+            # Update display
+            dirty_rects = dirty.end_frame(screen)
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
+            profiler.lap("display")
+            
+        profiler.end_frame()
         
-        # Update display
-        pygame.display.flip()
-        clock.tick(FPS)
+        if capture is not None:
+            capture.add_frame(screen, redrawn)
+            if game_state == STATE_GAME_OVER:
+                capture_hold -= 1
+                running = running and capture_hold > 0
+            # Render as fast as the writer keeps up, one fixed frame of game time each
+            clock.tick()
+            dt = 1000 / FPS
+        else:
+            dt = clock.tick(FPS)
     
+    if capture is not None:
+        capture.close()
+    if results is not None:
+        # Keep the game in progress too, if it got as far as a roll
+        if not result_recorded and any(len(player.dice_history) for player in players):
+            record_result(results, players)
+        results.close()
+    if profiler.trace_path:
+        profiler.dump()
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,218 @@
+"""Search for snake and ladder placements that hit target game statistics.
+
+Simulated annealing over board layouts: each step moves one end of one
+snake or ladder, keeping the board valid (see validate_jumps), and is kept
+or undone by the Metropolis rule. Candidates are scored exactly with the
+absorbing-chain solve from snake_and_ladder_analytics, so there's no
+sampling noise, and scores are memoized by board config since annealing
+revisits layouts often.
+
+The cost is the sum of squared misses against each target, in units of its
+tolerance, so a cost below 1 meets every target:
+
+    mean      expected total dice rolls in a game
+    stddev    standard deviation of the total rolls
+    advantage first player's win probability minus 1 / players
+
+Independent chains run in worker processes, each seeded only from the base
+seed and its index, so the best board found doesn't depend on --workers.
+Requires NumPy.
+
+    python snake_and_ladder_optimizer.py --mean 40 --stddev 15 --advantage 0 --output boards/quick.json
+"""
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from snake_and_ladder_analytics import analyze_board
+from snake_and_ladder_rules import DEFAULT_BOARD, Board, load_board, validate_jumps
+from snake_and_ladder_sim import derive_seed
+
+# Scoring doesn't need the far tail of the turn distribution; this is
+# several times faster than the analytics default and moves the statistics
+# by less than 1e-6
+EVALUATION_TOLERANCE = 1e-9
+
+DEFAULT_TOLERANCES = {"mean": 0.5, "stddev": 0.5, "advantage": 0.005}
+
+MAX_MUTATION_TRIES = 1000
+
+
+@lru_cache(maxsize=65536)
+def _metrics(key, num_players):
+    analysis = analyze_board(Board.from_key(key), num_players, EVALUATION_TOLERANCE)
+    advantage = float(analysis.win_probabilities[0]) - 1 / num_players
+    return {"mean": analysis.expected_game_length, "stddev": analysis.game_length_stddev,
+            "advantage": advantage}
+
+
+def board_metrics(board, num_players=2):
+    """Expected game length, its standard deviation and the first player's advantage"""
+    return dict(_metrics(board.key(), num_players))
+
+
+class Objective:
+    """Target values for some of the metrics and how far each may be off"""
+
+    def __init__(self, targets, num_players=2, tolerances=None):
+        unknown = set(targets) - set(DEFAULT_TOLERANCES)
+        if unknown:
+            raise ValueError(f"unknown targets {sorted(unknown)}")
+        if not targets:
+            raise ValueError("need at least one target")
+        self.targets = dict(targets)
+        self.num_players = num_players
+        self.tolerances = dict(DEFAULT_TOLERANCES)
+        self.tolerances.update(tolerances or {})
+
+    def cost(self, board):
+        metrics = _metrics(board.key(), self.num_players)
+        return sum(((metrics[name] - target) / self.tolerances[name]) ** 2
+                   for name, target in self.targets.items())
+
+
+def mutate(board, rng):
+    """A valid board with one end of one snake or ladder moved"""
+    size = board.size
+    step = board.grid or 10  # About a row
+    for _ in range(MAX_MUTATION_TRIES):
+        snakes, ladders = dict(board.snakes), dict(board.ladders)
+        jumps = snakes if not ladders or (snakes and rng.random() < 0.5) else ladders
+        start = rng.choice(sorted(jumps))
+        end = jumps.pop(start)
+
+        # Mostly small moves, with the odd jump anywhere on the board
+        if rng.random() < 0.5:
+            start = start + rng.randint(-step, step) if rng.random() < 0.8 else rng.randint(1, size - 1)
+        else:
+            end = end + rng.randint(-step, step) if rng.random() < 0.8 else rng.randint(1, size)
+        if start in jumps:
+            continue  # Would replace another jump
+        jumps[start] = end
+        try:
+            validate_jumps(size, snakes, ladders)
+        except ValueError:
+            continue
+        return Board(snakes, ladders, size)
+    raise RuntimeError("couldn't find a valid mutation")
+
+
+def random_board(rng, size, num_snakes, num_ladders):
+    """A random valid board with the given number of snakes and ladders"""
+    if 2 * (num_snakes + num_ladders) > size - 1:
+        raise ValueError(f"{num_snakes} snakes and {num_ladders} ladders don't fit on {size} squares")
+    for _ in range(MAX_MUTATION_TRIES):
+        squares = rng.sample(range(1, size), 2 * (num_snakes + num_ladders))
+        pairs = [sorted(squares[i:i + 2]) for i in range(0, len(squares), 2)]
+        snakes = {high: low for low, high in pairs[:num_snakes]}
+        ladders = {low: high for low, high in pairs[num_snakes:]}
+        try:
+            return Board(snakes, ladders, size)
+        except ValueError:
+            continue
+    raise RuntimeError(f"couldn't place {num_snakes} snakes and {num_ladders} ladders on {size} squares")
+
+
+def anneal(board, objective, steps, rng, start_temperature=10.0, end_temperature=0.01):
+    """Anneal from board; returns (best board, its cost)"""
+    cost = objective.cost(board)
+    best, best_cost = board, cost
+    cooling = (end_temperature / start_temperature) ** (1 / max(steps - 1, 1))
+    temperature = start_temperature
+    for _ in range(steps):
+        candidate = mutate(board, rng)
+        candidate_cost = objective.cost(candidate)
+        if candidate_cost <= cost or rng.random() < math.exp((cost - candidate_cost) / temperature):
+            board, cost = candidate, candidate_cost
+            if cost < best_cost:
+                best, best_cost = board, cost
+        temperature *= cooling
+    return best, best_cost
+
+
+def _run_chain(board, objective, steps, seed, random_start):
+    rng = random.Random(seed)
+    if random_start:
+        board = random_board(rng, board.size, len(board.snakes), len(board.ladders))
+    misses = _metrics.cache_info().misses
+    best, cost = anneal(board, objective, steps, rng)
+    return best, cost, _metrics.cache_info().misses - misses
+
+
+def optimize(board, objective, chains=8, steps=5000, seed=0, workers=None, random_start=False):
+    """Run independent annealing chains and return (best board, cost, boards evaluated).
+
+    Boards a worker had already scored for an earlier chain aren't counted
+    as evaluated.
+
+    Chains start from board, or from random boards with as many snakes and
+    ladders if random_start is set. Ties go to the lowest chain index.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_run_chain, board, objective, steps, derive_seed(seed, chain), random_start)
+                   for chain in range(chains)]
+        results = [future.result() for future in futures]
+    best, cost, _ = min(results, key=lambda result: result[1])
+    return best, cost, sum(evaluated for _, _, evaluated in results)
+
+
+def board_config(board):
+    """Board as a config dict in the format of the files in boards/"""
+    return {
+        "size": board.size,
+        "snakes": {str(start): end for start, end in sorted(board.snakes.items())},
+        "ladders": {str(start): end for start, end in sorted(board.ladders.items())},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Optimize snake and ladder placements for target statistics")
+    parser.add_argument("--board", help="board config JSON file to start from (default: standard board)")
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--mean", type=float, help="target expected total dice rolls per game")
+    parser.add_argument("--stddev", type=float, help="target standard deviation of total rolls")
+    parser.add_argument("--advantage", type=float,
+                        help="target first-player win probability minus 1 / players (e.g. 0)")
+    for name, tolerance in DEFAULT_TOLERANCES.items():
+        parser.add_argument(f"--{name}-tolerance", type=float, default=tolerance)
+    parser.add_argument("--chains", type=int, default=os.cpu_count())
+    parser.add_argument("--steps", type=int, default=5000, help="annealing steps per chain")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--random-start", action="store_true",
+                        help="start each chain from a random board with the same number of snakes and ladders")
+    parser.add_argument("--output", help="write the best board config as JSON to this file")
+    args = parser.parse_args()
+
+    targets = {name: getattr(args, name) for name in DEFAULT_TOLERANCES if getattr(args, name) is not None}
+    if not targets:
+        parser.error("give at least one of --mean, --stddev and --advantage")
+    tolerances = {name: getattr(args, f"{name}_tolerance") for name in DEFAULT_TOLERANCES}
+    objective = Objective(targets, args.players, tolerances)
+    board = load_board(args.board) if args.board else DEFAULT_BOARD
+
+    start = time.perf_counter()
+    best, cost, evaluated = optimize(board, objective, args.chains, args.steps, args.seed, args.workers,
+                                     args.random_start)
+    elapsed = time.perf_counter() - start
+
+    print(f"start: {board_metrics(board, args.players)}")
+    print(f"best:  {board_metrics(best, args.players)} (cost {cost:.4g})")
+    print(f"{args.chains * args.steps} steps, {evaluated} boards evaluated in {elapsed:.1f}s "
+          f"({args.workers} workers)")
+    config = json.dumps(board_config(best), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(config + "\n")
+        print(f"wrote {args.output}")
+    else:
+        print(config)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Replay logs for Snake and Ladder games.
+
+A replay is newline-delimited JSON:
+
+    {"version": 1, "seed": 42, "players": 2, "snapshot_interval": 32, "board": {...}}
+    {"turn": 0, "positions": [0, 0], "rolls": "3516242..."}
+    {"turn": 32, "positions": [41, 38], "rolls": "62..."}
+    ...
+    {"end": {"turns": 57, "winner": 0, "positions": [100, 77]}}
+
+Each block line holds a snapshot of all positions at the start of the block
+followed by the next snapshot_interval rolls as a digit string. Player p
+rolls on turns p, p + n, p + 2n, ... Seeking to any turn restores the
+nearest snapshot and applies fewer than snapshot_interval rolls, so it's
+O(1) in the length of the game.
+"""
+import argparse
+import json
+import random
+
+from snake_and_ladder_rules import DEFAULT_BOARD, DICE_SIDES, Board
+
+REPLAY_VERSION = 1
+DEFAULT_SNAPSHOT_INTERVAL = 32
+
+
+class ReplayWriter:
+    """Streams a game's rolls to a replay file as they happen"""
+
+    def __init__(self, stream, num_players, board=DEFAULT_BOARD, seed=None,
+                 snapshot_interval=DEFAULT_SNAPSHOT_INTERVAL):
+        self.stream = stream
+        self.board = board
+        self.snapshot_interval = snapshot_interval
+        self.positions = [0] * num_players
+        self.turn = 0
+        self.winner = None
+        self.block_positions = list(self.positions)
+        self.block_rolls = []
+
+        header = {
+            "version": REPLAY_VERSION,
+            "seed": seed,
+            "players": num_players,
+            "snapshot_interval": snapshot_interval,
+            "board": board.to_dict(),
+        }
+        self._write(header)
+
+    def _write(self, record):
+        self.stream.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def _flush_block(self):
+        block_start = self.turn - len(self.block_rolls)
+        self._write({
+            "turn": block_start,
+            "positions": self.block_positions,
+            "rolls": "".join(map(str, self.block_rolls)),
+        })
+        self.block_positions = list(self.positions)
+        self.block_rolls = []
+
+    def record(self, roll):
+        """Record the roll for the player whose turn it is; returns their new position"""
+        if self.winner is not None:
+            raise ValueError("game is already over")
+        if not 1 <= roll <= DICE_SIDES:
+            raise ValueError(f"invalid roll {roll}")
+
+        player = self.turn % len(self.positions)
+        position = self.board.resolve_move(self.positions[player], roll)
+        self.positions[player] = position
+        self.block_rolls.append(roll)
+        self.turn += 1
+
+        if self.board.is_finished(position):
+            self.winner = player
+        if len(self.block_rolls) == self.snapshot_interval:
+            self._flush_block()
+        return position
+
+    def close(self):
+        if self.block_rolls:
+            self._flush_block()
+        self._write({"end": {"turns": self.turn, "winner": self.winner, "positions": self.positions}})
+
+
+class Replay:
+    """A loaded replay that can jump to the state at any turn"""
+
+    def __init__(self, header, blocks, end):
+        if header.get("version") != REPLAY_VERSION:
+            raise ValueError(f"unsupported replay version {header.get('version')}")
+        self.seed = header["seed"]
+        self.num_players = header["players"]
+        self.snapshot_interval = header["snapshot_interval"]
+        self.board = Board.from_dict(header["board"])
+        self.blocks = blocks
+        self.num_turns = end["turns"]
+        self.winner = end["winner"]
+        self.final_positions = end["positions"]
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_lines(f)
+
+    @classmethod
+    def from_lines(cls, lines):
+        records = [json.loads(line) for line in lines if line.strip()]
+        if not records or "end" not in records[-1]:
+            raise ValueError("truncated replay: missing end record")
+        return cls(records[0], records[1:-1], records[-1]["end"])
+
+    def roll(self, turn):
+        """The roll made on the given turn (0-based)"""
+        block = self.blocks[turn // self.snapshot_interval]
+        return int(block["rolls"][turn % self.snapshot_interval])
+
+    def positions_at(self, turn):
+        """Positions of all players after the first turn rolls have been made"""
+        if not 0 <= turn <= self.num_turns:
+            raise IndexError(f"turn {turn} outside 0..{self.num_turns}")
+        if turn == self.num_turns:
+            return list(self.final_positions)
+
+        block = self.blocks[turn // self.snapshot_interval]
+        positions = list(block["positions"])
+        block_start = block["turn"]
+        for offset in range(turn - block_start):
+            player = (block_start + offset) % self.num_players
+            positions[player] = self.board.resolve_move(positions[player], int(block["rolls"][offset]))
+        return positions
+
+    def player_to_move(self, turn):
+        return turn % self.num_players
+
+
+def write_replay(path, rolls, num_players, board=DEFAULT_BOARD, seed=None,
+                 snapshot_interval=DEFAULT_SNAPSHOT_INTERVAL, exclusive=False):
+    """Write a replay for rolls given in turn order.
+
+    With exclusive set, raises FileExistsError rather than overwriting path.
+    """
+    with open(path, "x" if exclusive else "w") as f:
+        writer = ReplayWriter(f, num_players, board, seed, snapshot_interval)
+        for roll in rolls:
+            writer.record(roll)
+            if writer.winner is not None:
+                break
+        writer.close()
+    return writer
+
+
+def rolls_from_dice_history(histories):
+    """Interleave per-player dice histories (Player.dice_history) into turn order.
+
+    The histories must be complete: a capped DiceHistory that has dropped
+    rolls can't be replayed.
+    """
+    if any(getattr(history, "dropped", 0) for history in histories):
+        raise ValueError("dice history is missing its oldest rolls")
+    rolls = []
+    for turn in range(sum(len(history) for history in histories)):
+        history = histories[turn % len(histories)]
+        index = turn // len(histories)
+        if index >= len(history):
+            break
+        rolls.append(history[index])
+    return rolls
+
+
+def record_game(path, num_players=2, board=DEFAULT_BOARD, seed=None,
+                snapshot_interval=DEFAULT_SNAPSHOT_INTERVAL):
+    """Play a seeded game and write its replay to path"""
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        writer = ReplayWriter(f, num_players, board, seed, snapshot_interval)
+        while writer.winner is None:
+            writer.record(rng.randint(1, DICE_SIDES))
+        writer.close()
+    return writer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect a Snake and Ladder replay")
+    parser.add_argument("path")
+    parser.add_argument("--turn", type=int, default=None, help="show positions after this many turns")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.path)
+    print(f"seed: {replay.seed}, players: {replay.num_players}, turns: {replay.num_turns}, "
+          f"winner: {replay.winner}")
+    if args.turn is not None:
+        print(f"positions after turn {args.turn}: {replay.positions_at(args.turn)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Snake and Ladder game rules, independent of pygame.
+
+Importing this module has no side effects, so it can be used from tests,
+simulations and servers that have no display.
+"""
+import json
+import math
+
+BOARD_SQUARES = 100
+DICE_SIDES = 6
+
+# Rule variants. In the standard game you move by the roll. With
+# "choose-die" you roll two dice and move by either one. With
+# "optional-move" you may decline to move after rolling.
+VARIANT_STANDARD = "standard"
+VARIANT_CHOOSE_DIE = "choose-die"
+VARIANT_OPTIONAL_MOVE = "optional-move"
+VARIANTS = (VARIANT_STANDARD, VARIANT_CHOOSE_DIE, VARIANT_OPTIONAL_MOVE)
+
+# Define snakes and ladders
+snakes = {
+    16: 6,
+    47: 26,
+    49: 11,
+    56: 53,
+    62: 19,
+    64: 60,
+    87: 24,
+    93: 73,
+    95: 75,
+    98: 78
+}
+
+ladders = {
+    1: 38,
+    4: 14,
+    9: 31,
+    21: 42,
+    28: 84,
+    36: 44,
+    51: 67,
+    71: 91,
+    80: 100
+}
+
+
+def validate_jumps(size, snakes, ladders):
+    """Check that snakes and ladders form a valid jump index for a board of size squares.
+
+    Raises ValueError for jumps that leave the board or go the wrong way, for
+    two jumps sharing a start or end square, and for chains where one jump
+    ends on the start of another. Without chains there can't be cycles, so
+    every move resolves with a single lookup.
+    """
+    if size < 2:
+        raise ValueError(f"board needs at least 2 squares, got {size}")
+
+    for kind, jumps in (("snake", snakes), ("ladder", ladders)):
+        for start, end in jumps.items():
+            if not 1 <= start < size or not 1 <= end <= size:
+                raise ValueError(f"{kind} {start}->{end} is off the board (1..{size})")
+            if kind == "snake" and end >= start:
+                raise ValueError(f"snake {start}->{end} must go down")
+            if kind == "ladder" and end <= start:
+                raise ValueError(f"ladder {start}->{end} must go up")
+
+    shared_starts = snakes.keys() & ladders.keys()
+    if shared_starts:
+        raise ValueError(f"square {min(shared_starts)} is the start of both a snake and a ladder")
+
+    ends = {}
+    for start, end in list(snakes.items()) + list(ladders.items()):
+        if end in ends:
+            raise ValueError(f"jumps from {ends[end]} and {start} both end on square {end}")
+        ends[end] = start
+        if end in snakes or end in ladders:
+            raise ValueError(f"jump {start}->{end} chains into another jump at {end}")
+
+
+class Board:
+    """Board config: number of squares plus the snake and ladder jumps"""
+
+    def __init__(self, snakes=snakes, ladders=ladders, size=BOARD_SQUARES):
+        validate_jumps(size, snakes, ladders)
+        self.size = size
+        self.snakes = dict(snakes)
+        self.ladders = dict(ladders)
+        self.jumps = dict(self.snakes)
+        self.jumps.update(self.ladders)
+
+        # Validated jump index: the resting square for every square landed on
+        self.jump_table = list(range(size + 1))
+        for start, end in self.jumps.items():
+            self.jump_table[start] = end
+
+        # Destination for every (position, roll) pair, indexed as
+        # move_table[position][roll - 1]. Rolls past the last square leave
+        # the player where they are.
+        self.move_table = []
+        for position in range(size + 1):
+            row = self.jump_table[position + 1:position + DICE_SIDES + 1]
+            row += [position] * (DICE_SIDES - len(row))
+            self.move_table.append(row)
+
+    @property
+    def grid(self):
+        """Side length of the square grid the board is drawn on, or None"""
+        side = math.isqrt(self.size)
+        return side if side * side == self.size else None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a board from a config dict with "size" or "grid", "snakes" and "ladders".
+
+        Snakes and ladders may be given as {"start": end} mappings or as
+        [[start, end], ...] lists.
+        """
+        if "grid" in data:
+            size = data["grid"] * data["grid"]
+            if data.get("size", size) != size:
+                raise ValueError(f"grid {data['grid']} doesn't match size {data['size']}")
+        else:
+            size = data.get("size", BOARD_SQUARES)
+        return cls(_jump_dict(data.get("snakes", {})), _jump_dict(data.get("ladders", {})), size)
+
+    def to_dict(self):
+        return {
+            "size": self.size,
+            "snakes": sorted(self.snakes.items()),
+            "ladders": sorted(self.ladders.items()),
+        }
+
+    def key(self):
+        """Hashable identity of the board config, for caching results"""
+        return (self.size, tuple(sorted(self.snakes.items())), tuple(sorted(self.ladders.items())))
+
+    @classmethod
+    def from_key(cls, key):
+        """Rebuild a board from its key(), e.g. inside a cache keyed by it"""
+        size, snakes, ladders = key
+        return cls(dict(snakes), dict(ladders), size)
+
+    def can_move(self, position, steps):
+        """A move is only allowed if it doesn't overshoot the last square"""
+        return position + steps <= self.size
+
+    def jump(self, position):
+        """Follow a snake or ladder starting at position, if there is one"""
+        return self.jump_table[position]
+
+    def resolve_move(self, position, steps):
+        """Return the position after rolling steps from position"""
+        if not self.can_move(position, steps):
+            return position
+        return self.jump_table[position + steps]
+
+    def is_finished(self, position):
+        return position == self.size
+
+
+def roll_outcomes(variant=VARIANT_STANDARD):
+    """All distinct dice outcomes of one turn as (dice, probability) pairs"""
+    if variant not in VARIANTS:
+        raise ValueError(f"unknown variant {variant!r}")
+    if variant != VARIANT_CHOOSE_DIE:
+        return [((roll,), 1 / DICE_SIDES) for roll in range(1, DICE_SIDES + 1)]
+
+    # Two dice; the order doesn't matter since either one can be used
+    outcomes = {}
+    for first in range(1, DICE_SIDES + 1):
+        for second in range(1, DICE_SIDES + 1):
+            dice = (min(first, second), max(first, second))
+            outcomes[dice] = outcomes.get(dice, 0) + 1 / DICE_SIDES ** 2
+    return list(outcomes.items())
+
+
+def move_options(board, position, dice, variant=VARIANT_STANDARD):
+    """Moves available after rolling dice, as (steps, destination) pairs.
+
+    steps is 0 for declining to move. Options with the same destination are
+    only listed once.
+    """
+    options = {}
+    if variant == VARIANT_OPTIONAL_MOVE:
+        options[position] = 0
+    for roll in dice:
+        destination = board.resolve_move(position, roll)
+        if destination not in options:
+            # An overshooting roll doesn't move the player
+            options[destination] = roll if destination != position else 0
+    return [(steps, destination) for destination, steps in options.items()]
+
+
+def _jump_dict(jumps):
+    items = jumps.items() if isinstance(jumps, dict) else jumps
+    return {int(start): int(end) for start, end in items}
+
+
+def load_board(path):
+    """Load and validate a board config from a JSON file"""
+    with open(path) as f:
+        return Board.from_dict(json.load(f))
+
+
+# Standard board used by the game
+DEFAULT_BOARD = Board()
@@ -0,0 +1,409 @@
+"""Multiplayer Snake and Ladder server hosting many rooms in one process.
+
+Clients talk to the server over TCP in newline-delimited JSON. A connection
+can hold any number of seats, in one room or in several:
+
+    -> {"op": "join", "r": "r1", "players": 2, "id": 1}
+    <- {"op": "joined", "seat": 0, "r": "r1", "players": 2, "positions": [0, 0], "turn": 0, "id": 1}
+    -> {"op": "roll", "r": "r1", "id": 2}
+    <- {"r": "r1", "t": 0, "s": 0, "d": 4, "p": 14, "id": 2}
+
+The server rolls the dice, so the seat whose turn it is only asks for a roll.
+Each move goes to every connection in the room as a compact diff: room, turn
+number, seat, roll and the seat's new position, plus "w" (the winner) on the
+last move. A client knows every position from the join snapshot plus the
+diffs, and can animate a move with Player.start_move(roll). Gaps in "t" mean
+it missed a message. Errors come back as {"error": "...", "r": room}.
+
+A request may carry an "id", which is echoed in its reply or error so a
+client can match them up. Only the connection that asked for a roll gets its
+diff with the id; the other connections in the room get the plain diff.
+{"op": "stats"} reports the room count and recent turn latencies. A line
+longer than MAX_LINE gets a "line too long" error and the connection closed.
+
+Moves follow the same rules as the game. Snakes and ladders resolve in the
+same turn, and an overshooting roll forfeits the move. A finished room is
+closed, so joining the same name again starts a new game.
+"""
+import abc
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import deque
+
+from snake_and_ladder_rules import DEFAULT_BOARD, DICE_SIDES, load_board
+
+DEFAULT_PORT = 8765
+MAX_PLAYERS = 8
+
+# Number of recent turns kept for the latency percentiles reported by "stats"
+LATENCY_WINDOW = 100000
+
+# Longest message line accepted; a peer sending more without a newline is cut off
+MAX_LINE = 64 * 1024
+
+
+def encode(record):
+    return (json.dumps(record, separators=(",", ":")) + "\n").encode()
+
+
+class ProtocolError(ValueError):
+    """A bad request; its message is sent to the client as the error"""
+
+
+def reply(record, request_id):
+    """record with the request's id echoed, if it had one"""
+    return record if request_id is None else dict(record, id=request_id)
+
+
+class LineProtocol(asyncio.Protocol, abc.ABC):
+    """Newline-delimited framing on a raw transport; subclasses handle each line.
+
+    Incoming data is split into lines, so a burst of requests is handled in
+    one callback. Outgoing messages are queued and written with a single
+    transport.write() per event loop iteration instead of one syscall each.
+    """
+
+    def __init__(self):
+        self.transport = None
+        self.buffer = b""
+        self.outgoing = []
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        lines = (self.buffer + data).split(b"\n")
+        self.buffer = lines.pop()
+        if len(self.buffer) > MAX_LINE or any(len(line) > MAX_LINE for line in lines):
+            self.buffer = b""
+            self.line_too_long()
+            return
+        for line in lines:
+            if line:
+                self.line_received(line)
+
+    @abc.abstractmethod
+    def line_received(self, line):
+        """Handle one line, without its newline"""
+
+    def line_too_long(self):
+        """Called instead of line_received for a line over MAX_LINE; drops the connection"""
+        self.flush()
+        self.transport.close()
+
+    def send(self, data):
+        if not self.outgoing:
+            asyncio.get_running_loop().call_soon(self.flush)
+        self.outgoing.append(data)
+
+    def flush(self):
+        if self.outgoing and not self.transport.is_closing():
+            self.transport.write(b"".join(self.outgoing))
+        self.outgoing.clear()
+
+
+class Room:
+    """One game: seats, positions and whose turn it is, without any rendering"""
+
+    def __init__(self, room_id, num_players, board=DEFAULT_BOARD, rng=None):
+        if not 1 <= num_players <= MAX_PLAYERS:
+            raise ProtocolError(f"players must be between 1 and {MAX_PLAYERS}")
+        self.room_id = room_id
+        self.board = board
+        self.rng = rng if rng is not None else random.Random()
+        self.positions = [0] * num_players
+        self.seats = [None] * num_players
+        self.turn = 0
+        self.winner = None
+
+    @property
+    def num_players(self):
+        return len(self.positions)
+
+    def is_full(self):
+        return None not in self.seats
+
+    def player_to_move(self):
+        return self.turn % self.num_players
+
+    def connections(self):
+        """Distinct connections holding a seat in this room"""
+        return list(dict.fromkeys(seat for seat in self.seats if seat is not None))
+
+    def join(self, connection):
+        """Give connection the first free seat and return its number"""
+        if self.is_full():
+            raise ProtocolError("room is full")
+        seat = self.seats.index(None)
+        self.seats[seat] = connection
+        return seat
+
+    def leave(self, connection):
+        self.seats = [None if seat is connection else seat for seat in self.seats]
+
+    def state(self):
+        return {"r": self.room_id, "players": self.num_players, "positions": self.positions,
+                "turn": self.turn}
+
+    def roll(self, connection):
+        """Roll for the seat whose turn it is and return the move as a diff"""
+        if self.winner is not None:
+            raise ProtocolError("game is over")
+        if not self.is_full():
+            raise ProtocolError("waiting for players")
+        player = self.player_to_move()
+        if self.seats[player] is not connection:
+            raise ProtocolError("not your turn")
+
+        roll = self.rng.randint(1, DICE_SIDES)
+        position = self.board.resolve_move(self.positions[player], roll)
+        self.positions[player] = position
+        diff = {"r": self.room_id, "t": self.turn, "s": player, "d": roll, "p": position}
+        self.turn += 1
+        if self.board.is_finished(position):
+            self.winner = player
+            diff["w"] = player
+        return diff
+
+
+class ServerConnection(LineProtocol):
+    """One client connection and the rooms it has seats in"""
+
+    def __init__(self, server):
+        super().__init__()
+        self.server = server
+        self.rooms = set()
+        self.received_at = 0.0
+
+    def data_received(self, data):
+        self.received_at = time.perf_counter()
+        super().data_received(data)
+
+    def line_received(self, line):
+        self.server.handle_message(self, line)
+
+    def connection_lost(self, exc):
+        self.server.disconnect(self)
+
+    def line_too_long(self):
+        self.send(encode({"error": "line too long", "r": None}))
+        super().line_too_long()
+
+    # Stop taking requests from a client that isn't reading its replies
+    def pause_writing(self):
+        self.transport.pause_reading()
+
+    def resume_writing(self):
+        self.transport.resume_reading()
+
+
+class GameServer:
+    """Hosts rooms on one asyncio event loop"""
+
+    def __init__(self, board=DEFAULT_BOARD, seed=None):
+        self.board = board
+        self.seed = seed
+        self.rooms = {}
+        self.server = None
+        self.turns = 0
+        # Seconds from a roll request arriving to its diff being queued
+        self.turn_latencies = deque(maxlen=LATENCY_WINDOW)
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        """Start listening; port 0 picks a free port (see self.port)"""
+        loop = asyncio.get_running_loop()
+        self.server = await loop.create_server(lambda: ServerConnection(self), host, port)
+        return self.server
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def _room_rng(self, room_id):
+        # Seeded servers give every room its own reproducible dice
+        if self.seed is None:
+            return random.Random()
+        return random.Random(f"{self.seed}/{room_id}")
+
+    def handle_message(self, connection, line):
+        room_id = request_id = None
+        try:
+            try:
+                message = json.loads(line)
+            except ValueError:  # Also covers bytes that aren't UTF-8
+                raise ProtocolError("invalid JSON") from None
+            if not isinstance(message, dict):
+                raise ProtocolError("message must be an object")
+            request_id = message.get("id")
+            room_id = message.get("r")
+            if room_id is not None and not isinstance(room_id, str):
+                room_id = None
+                raise ProtocolError("room must be a string")
+
+            op = message.get("op")
+            if op == "join":
+                num_players = message.get("players", 2)
+                if not isinstance(num_players, int) or isinstance(num_players, bool):
+                    raise ProtocolError("players must be an integer")
+                self.join(connection, room_id, num_players, request_id)
+            elif op == "roll":
+                self.roll(connection, room_id, request_id)
+                self.turns += 1
+                self.turn_latencies.append(time.perf_counter() - connection.received_at)
+            elif op == "stats":
+                connection.send(encode(reply(dict(self.stats(), r=room_id), request_id)))
+            else:
+                raise ProtocolError("unknown op")
+        except ProtocolError as e:
+            connection.send(encode(reply({"error": str(e), "r": room_id}, request_id)))
+
+    def stats(self):
+        """Room count and recent turn latency percentiles in milliseconds"""
+        latencies = sorted(self.turn_latencies)
+        stats = {"rooms": len(self.rooms), "turns": self.turns}
+        for name, fraction in (("p50_ms", 0.50), ("p99_ms", 0.99), ("max_ms", 1.0)):
+            index = min(int(fraction * len(latencies)), len(latencies) - 1)
+            stats[name] = latencies[index] * 1000 if latencies else None
+        return stats
+
+    def disconnect(self, connection):
+        for room_id in connection.rooms:
+            room = self.rooms.get(room_id)
+            if room is not None:
+                room.leave(connection)
+                if not room.connections():
+                    del self.rooms[room_id]
+        connection.rooms.clear()
+
+    def join(self, connection, room_id, num_players, request_id=None):
+        if room_id is None:
+            raise ProtocolError("missing room")
+        room = self.rooms.get(room_id)
+        if room is None:
+            room = self.rooms[room_id] = Room(room_id, num_players, self.board, self._room_rng(room_id))
+        seat = room.join(connection)
+        connection.rooms.add(room_id)
+        connection.send(encode(reply(dict(op="joined", seat=seat, **room.state()), request_id)))
+
+    def roll(self, connection, room_id, request_id=None):
+        room = self.rooms.get(room_id)
+        if room is None:
+            raise ProtocolError("no such room")
+        diff = room.roll(connection)
+        self.broadcast(room, diff, connection, request_id)
+        if room.winner is not None:
+            del self.rooms[room_id]
+            for member in room.connections():
+                member.rooms.discard(room_id)
+
+    def broadcast(self, room, record, sender=None, request_id=None):
+        """Send record to every connection in room, with request_id echoed to sender"""
+        data = encode(record)
+        for connection in room.connections():
+            if connection is sender and request_id is not None:
+                connection.send(encode(reply(record, request_id)))
+            else:
+                connection.send(data)
+
+
+class GameClient(LineProtocol):
+    """Asyncio client; replies are matched to requests by id.
+
+    Diffs for moves by other connections in a room only update positions
+    and call on_diff; they never complete a request.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.positions = {}
+        self.pending = {}
+        self.next_id = 0
+        self.on_diff = None  # Called with every diff received, e.g. to animate moves
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=DEFAULT_PORT):
+        _, client = await asyncio.get_running_loop().create_connection(cls, host, port)
+        return client
+
+    def line_received(self, line):
+        message = json.loads(line)
+        room_id = message.get("r")
+        future = self.pending.pop(message.get("id"), None)
+        if future is not None and future.done():
+            future = None  # Cancelled, e.g. by an asyncio.wait_for timeout
+
+        if "error" in message:
+            if future is not None:
+                future.set_exception(RuntimeError(message["error"]))
+            return
+        if message.get("op") == "joined":
+            self.positions[room_id] = message["positions"]
+        elif "t" in message:
+            self.positions[room_id][message["s"]] = message["p"]
+            if self.on_diff is not None:
+                self.on_diff(message)
+        if future is not None:
+            future.set_result(message)
+
+    def connection_lost(self, exc):
+        for future in self.pending.values():
+            # A caller may have given up on it already, e.g. asyncio.wait_for timing out
+            if not future.done():
+                future.set_exception(ConnectionError("server closed the connection"))
+        self.pending.clear()
+
+    def _request(self, record):
+        self.next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self.pending[self.next_id] = future
+        self.send(encode(dict(record, id=self.next_id)))
+        return future
+
+    async def join(self, room_id, num_players=2):
+        return await self._request({"op": "join", "r": room_id, "players": num_players})
+
+    async def roll(self, room_id):
+        """Ask for the roll and wait for the resulting diff"""
+        return await self._request({"op": "roll", "r": room_id})
+
+    async def stats(self):
+        """Server-side room count and turn latency percentiles"""
+        return await self._request({"op": "stats"})
+
+    def close(self):
+        self.flush()
+        self.transport.close()
+
+
+async def serve(host, port, board=DEFAULT_BOARD, seed=None):
+    server = GameServer(board, seed)
+    await server.start(host, port)
+    print(f"serving on {host}:{server.port}", flush=True)
+    async with server.server:
+        await server.server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a Snake and Ladder multiplayer server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--board", help="board config JSON file (default: standard board)")
+    args = parser.parse_args()
+
+    board = load_board(args.board) if args.board else DEFAULT_BOARD
+    try:
+        asyncio.run(serve(args.host, args.port, board, args.seed))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
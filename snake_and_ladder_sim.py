@@ -0,0 +1,211 @@
+"""Headless batch simulator for Snake and Ladder.
+
+Plays many games with a seeded RNG using the rules from
+snake_and_ladder_rules and reports game-length and winner statistics.
+Doesn't import pygame, so it runs on machines without a display.
+"""
+import argparse
+import hashlib
+import random
+import time
+from array import array
+from collections import Counter
+
+from snake_and_ladder_rules import DEFAULT_BOARD, DICE_SIDES, load_board
+
+try:
+    import numpy as np
+except ImportError:
+    # The vectorized engine is optional; the pure-Python one always works
+    np = None
+
+
+def derive_seed(*parts):
+    """Independent, reproducible RNG seed from any repr()-able parts.
+
+    Used to give each tournament cell or annealing chain its own stream that
+    depends only on the base seed and what the stream is for.
+    """
+    material = repr(parts).encode()
+    return int.from_bytes(hashlib.sha256(material).digest()[:8], "little")
+
+
+def _is_ndarray(values):
+    return np is not None and isinstance(values, np.ndarray)
+
+
+class SimulationResult:
+    """Game lengths and winners for a batch of simulated games.
+
+    lengths and winners are either arrays from the array module (pure-Python
+    engine) or NumPy arrays (vectorized engine).
+    """
+
+    def __init__(self, num_players, lengths, winners):
+        self.num_players = num_players
+        self.lengths = lengths  # Total dice rolls per game
+        self.winners = winners  # Index of the winning player per game
+
+    @property
+    def num_games(self):
+        return len(self.lengths)
+
+    def mean_length(self):
+        if _is_ndarray(self.lengths):
+            return float(self.lengths.mean())
+        return sum(self.lengths) / len(self.lengths)
+
+    def length_stddev(self):
+        if _is_ndarray(self.lengths):
+            return float(self.lengths.std())
+        mean = self.mean_length()
+        return (sum((n - mean) ** 2 for n in self.lengths) / len(self.lengths)) ** 0.5
+
+    def length_histogram(self):
+        if _is_ndarray(self.lengths):
+            values, counts = np.unique(self.lengths, return_counts=True)
+            return Counter(dict(zip(values.tolist(), counts.tolist())))
+        return Counter(self.lengths)
+
+    def win_counts(self):
+        if _is_ndarray(self.winners):
+            return np.bincount(self.winners, minlength=self.num_players).tolist()
+        counts = [0] * self.num_players
+        for winner in self.winners:
+            counts[winner] += 1
+        return counts
+
+    def win_rates(self):
+        return [count / len(self.winners) for count in self.win_counts()]
+
+    def summary(self):
+        return {
+            "games": self.num_games,
+            "players": self.num_players,
+            "mean_length": self.mean_length(),
+            "stddev_length": self.length_stddev(),
+            "min_length": int(min(self.lengths)),
+            "max_length": int(max(self.lengths)),
+            "win_rates": self.win_rates(),
+        }
+
+
+def play_game(board, num_players, rng):
+    """Play one game and return its rolls in turn order; the last roll wins.
+
+    Players take turns in order starting with player 0. A roll that would
+    overshoot the last square leaves the player where they are and passes
+    the turn on. Each roll takes one rng.random() call, so the same seed
+    always plays the same game.
+    """
+    move_table = board.move_table
+    size = board.size
+    rand = rng.random
+    positions = [0] * num_players
+    rolls = []
+    append = rolls.append
+
+    while True:
+        for player in range(num_players):
+            roll = int(rand() * DICE_SIDES)
+            append(roll + 1)
+            position = move_table[positions[player]][roll]
+            positions[player] = position
+            if position == size:
+                return rolls
+
+
+def simulate_games(num_games, num_players=2, board=DEFAULT_BOARD, seed=None):
+    """Play num_games games with play_game and collect their lengths and winners"""
+    rng = random.Random(seed)
+    lengths = array("I")
+    winners = array("B")
+
+    for _ in range(num_games):
+        rolls = play_game(board, num_players, rng)
+        lengths.append(len(rolls))
+        winners.append((len(rolls) - 1) % num_players)
+
+    return SimulationResult(num_players, lengths, winners)
+
+
+def simulate_games_vectorized(num_games, num_players=2, board=DEFAULT_BOARD, seed=None,
+                              chunk_size=1000000):
+    """NumPy version of simulate_games for very large batches.
+
+    All games in a chunk advance in lockstep: each step rolls one die for
+    the current player of every unfinished game at once. Finished games are
+    dropped from the active set, so late steps only touch long games.
+    Results follow the same rules as simulate_games, but use NumPy's RNG,
+    so the individual games differ for the same seed.
+    """
+    if np is None:
+        raise RuntimeError("simulate_games_vectorized requires NumPy")
+
+    rng = np.random.default_rng(seed)
+    size = board.size
+
+    # Smallest dtypes that hold an overshooting landing square and a seat
+    # index; at least int16 and int8, which keeps seeded results unchanged
+    # for boards and player counts that fit them
+    position_dtype = np.promote_types(np.int16, np.min_scalar_type(size + DICE_SIDES))
+    seat_dtype = np.promote_types(np.int8, np.min_scalar_type(num_players - 1))
+
+    # Destination after landing on each square (snake, ladder or itself)
+    jump_table = np.array([board.jump(position) for position in range(size + 1)], dtype=position_dtype)
+
+    lengths = np.empty(num_games, dtype=np.int32)
+    winners = np.empty(num_games, dtype=seat_dtype)
+
+    for start in range(0, num_games, chunk_size):
+        count = min(chunk_size, num_games - start)
+        positions = np.zeros((num_players, count), dtype=position_dtype)
+        active = np.arange(count)
+        rolls = 0
+
+        while active.size:
+            for player in range(num_players):
+                rolls += 1
+                current = positions[player, active]
+                landing = current + rng.integers(1, DICE_SIDES + 1, size=active.size, dtype=position_dtype)
+
+                # Overshooting the last square means no move
+                moved = landing <= size
+                current = np.where(moved, jump_table[np.minimum(landing, size)], current)
+                positions[player, active] = current
+
+                finished = current == size
+                if finished.any():
+                    done = start + active[finished]
+                    lengths[done] = rolls
+                    winners[done] = player
+                    active = active[~finished]
+                    if not active.size:
+                        break
+
+    return SimulationResult(num_players, lengths, winners)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate Snake and Ladder games")
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--vectorized", action="store_true", help="use the NumPy engine")
+    parser.add_argument("--board", help="board config JSON file (default: standard board)")
+    args = parser.parse_args()
+
+    board = load_board(args.board) if args.board else DEFAULT_BOARD
+
+    simulate = simulate_games_vectorized if args.vectorized else simulate_games
+    start = time.perf_counter()
+    result = simulate(args.games, args.players, board=board, seed=args.seed)
+    elapsed = time.perf_counter() - start
+
+    for name, value in result.summary().items():
+        print(f"{name}: {value}")
+    print(f"games/sec: {args.games / elapsed:.0f}")
+
+
+if __name__ == "__main__":
+    main()
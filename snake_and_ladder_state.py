@@ -0,0 +1,151 @@
+"""Compact player and game state for simulations and servers.
+
+Plain objects cost hundreds of bytes each, which adds up when millions of
+players are held at once. PlayerState uses __slots__ and a packed dice
+history. GameStates keeps every game's positions, turn counts and won flags
+in flat arrays, a few bytes per player. The rendering Player in
+snake_and_ladder_modern wraps a PlayerState.
+"""
+from array import array
+
+from snake_and_ladder_rules import DEFAULT_BOARD
+
+
+class DiceHistory:
+    """Dice rolls packed one byte each.
+
+    With maxlen set it's a ring buffer that keeps only the latest maxlen
+    rolls. total still counts every roll ever appended.
+    """
+
+    __slots__ = ("rolls", "maxlen", "start", "total")
+
+    def __init__(self, rolls=(), maxlen=None):
+        if maxlen is not None and maxlen < 1:
+            raise ValueError("maxlen must be at least 1")
+        self.rolls = array("B")
+        self.maxlen = maxlen
+        self.start = 0  # Index of the oldest roll once the buffer has wrapped
+        self.total = 0
+        self.extend(rolls)
+
+    def append(self, roll):
+        if self.maxlen is None or len(self.rolls) < self.maxlen:
+            self.rolls.append(roll)
+        else:
+            self.rolls[self.start] = roll
+            self.start = (self.start + 1) % self.maxlen
+        self.total += 1
+
+    def extend(self, rolls):
+        for roll in rolls:
+            self.append(roll)
+
+    def clear(self):
+        del self.rolls[:]
+        self.start = 0
+        self.total = 0
+
+    @property
+    def dropped(self):
+        """Number of old rolls overwritten because of maxlen"""
+        return self.total - len(self.rolls)
+
+    def __len__(self):
+        return len(self.rolls)
+
+    def __iter__(self):
+        yield from self.rolls[self.start:]
+        yield from self.rolls[:self.start]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.tolist()[index]
+        if index < 0:
+            index += len(self.rolls)
+        if not 0 <= index < len(self.rolls):
+            raise IndexError("dice history index out of range")
+        return self.rolls[(self.start + index) % len(self.rolls)]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return f"DiceHistory({self.tolist()!r}, maxlen={self.maxlen!r})"
+
+    def tolist(self):
+        return list(self)
+
+
+class PlayerState:
+    """Position, win flag and dice history of one player"""
+
+    __slots__ = ("position", "won", "dice_history")
+
+    def __init__(self, position=0, history_maxlen=None):
+        self.position = position
+        self.won = False
+        self.dice_history = DiceHistory(maxlen=history_maxlen)
+
+    @property
+    def turns(self):
+        return self.dice_history.total
+
+    def reset(self):
+        self.position = 0
+        self.won = False
+        self.dice_history.clear()
+
+
+class GameStates:
+    """Struct-of-arrays state for many games with the same number of players.
+
+    Player p of game g is at index g * num_players + p of positions and won.
+    turns holds the number of turns played in each game, so the player to
+    move is turns[g] % num_players.
+    """
+
+    def __init__(self, num_games, num_players, board=DEFAULT_BOARD):
+        self.num_games = num_games
+        self.num_players = num_players
+        self.board = board
+        position_type = "H" if board.size < 2 ** 16 else "I"
+        self.positions = array(position_type, bytes(array(position_type).itemsize * num_games * num_players))
+        self.turns = array("I", bytes(4 * num_games))
+        self.won = array("B", bytes(num_games * num_players))
+
+    @property
+    def nbytes(self):
+        return sum(len(values) * values.itemsize for values in (self.positions, self.turns, self.won))
+
+    def player_to_move(self, game):
+        return self.turns[game] % self.num_players
+
+    def game_positions(self, game):
+        start = game * self.num_players
+        return self.positions[start:start + self.num_players].tolist()
+
+    def winner(self, game):
+        """Seat that won the game, or None while it's still going"""
+        start = game * self.num_players
+        for player in range(self.num_players):
+            if self.won[start + player]:
+                return player
+        return None
+
+    def play_turn(self, game, roll):
+        """Apply roll for the player to move in game; returns their new position"""
+        index = game * self.num_players + self.turns[game] % self.num_players
+        position = self.board.resolve_move(self.positions[index], roll)
+        self.positions[index] = position
+        self.turns[game] += 1
+        if self.board.is_finished(position):
+            self.won[index] = 1
+        return position
+
+    def reset(self, game):
+        start = game * self.num_players
+        for index in range(start, start + self.num_players):
+            self.positions[index] = 0
+            self.won[index] = 0
+        self.turns[game] = 0
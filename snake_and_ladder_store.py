@@ -0,0 +1,350 @@
+"""SQLite store of finished games for leaderboards and board statistics.
+
+Every game is stored with its board, its players, each turn's roll and
+resulting position, and every snake or ladder taken:
+
+    boards(id, size, config)
+    games(id, board_id, played_at, source, num_players, turns, winner)
+    players(game_id, seat, board_id, name, won)
+    turns(game_id, turn, seat, roll, position)
+    jumps(board_id, square, destination, game_id, turn)
+
+Games are inserted in batches, one transaction per batch, so simulations can
+add millions of rows quickly. ResultWriter does the inserts on a background
+thread so the game loop never waits on the disk. The queries behind the
+leaderboard, snake/ladder hit counts and game length distributions are
+answered from covering indexes.
+
+    python snake_and_ladder_store.py results.db --simulate 100000 --players 2
+    python snake_and_ladder_store.py results.db --leaderboard --hits --lengths
+"""
+import argparse
+import json
+import queue
+import random
+import sqlite3
+import sys
+import threading
+import time
+
+from snake_and_ladder_rules import DEFAULT_BOARD, DICE_SIDES, load_board
+from snake_and_ladder_sim import play_game
+
+SCHEMA_VERSION = 1
+DEFAULT_BATCH_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS boards (
+    id INTEGER PRIMARY KEY,
+    size INTEGER NOT NULL,
+    config TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    board_id INTEGER NOT NULL REFERENCES boards(id),
+    played_at REAL NOT NULL,
+    source TEXT NOT NULL,
+    num_players INTEGER NOT NULL,
+    turns INTEGER NOT NULL,
+    winner INTEGER
+);
+CREATE TABLE IF NOT EXISTS players (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    seat INTEGER NOT NULL,
+    board_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    won INTEGER NOT NULL,
+    PRIMARY KEY (game_id, seat)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS turns (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    turn INTEGER NOT NULL,
+    seat INTEGER NOT NULL,
+    roll INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (game_id, turn)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS jumps (
+    board_id INTEGER NOT NULL,
+    square INTEGER NOT NULL,
+    destination INTEGER NOT NULL,
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    turn INTEGER NOT NULL,
+    PRIMARY KEY (game_id, turn)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS games_by_board ON games (board_id, turns, winner);
+CREATE INDEX IF NOT EXISTS players_by_name ON players (name, won);
+CREATE INDEX IF NOT EXISTS players_by_board ON players (board_id, name, won);
+CREATE INDEX IF NOT EXISTS jumps_by_square ON jumps (board_id, square, destination);
+"""
+
+
+class GameRecord:
+    """A game to store: its board, rolls in turn order and player names.
+
+    names may be None for simulated games, which then get no player rows.
+    A game whose rolls don't reach the last square is stored as unfinished.
+    """
+
+    __slots__ = ("board", "rolls", "names", "num_players", "played_at", "source")
+
+    def __init__(self, board, rolls, num_players=None, names=None, played_at=None, source="game"):
+        if num_players is None:
+            if names is None:
+                raise ValueError("need num_players or names")
+            num_players = len(names)
+        if names is not None and len(names) != num_players:
+            raise ValueError(f"{len(names)} names for {num_players} players")
+        self.board = board
+        self.rolls = rolls
+        self.names = names
+        self.num_players = num_players
+        self.played_at = played_at if played_at is not None else time.time()
+        self.source = source
+
+
+class ResultStore:
+    """Games in an SQLite database; use from one thread at a time"""
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        # WAL lets readers query while a writer inserts; NORMAL sync only
+        # risks the last transactions on power loss, not corruption
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            raise ValueError(f"unsupported result store version {version}")
+        self.connection.executescript(SCHEMA)
+        self.connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._board_ids = {}
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def board_id(self, board, create=False):
+        """Row id of board, or None if it has no games and create is false"""
+        key = board.key()
+        if key in self._board_ids:
+            return self._board_ids[key]
+        config = json.dumps(board.to_dict(), separators=(",", ":"))
+        row = self.connection.execute("SELECT id FROM boards WHERE config = ?", (config,)).fetchone()
+        if row is None:
+            if not create:
+                return None
+            row = (self.connection.execute("INSERT INTO boards (size, config) VALUES (?, ?)",
+                                           (board.size, config)).lastrowid,)
+        self._board_ids[key] = row[0]
+        return row[0]
+
+    def add_games(self, records):
+        """Insert games in one transaction; returns the number inserted"""
+        games, players, turns, jumps = [], [], [], []
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Ids are assigned here so all the rows can go in with executemany
+            game_id = connection.execute("SELECT COALESCE(MAX(id), 0) FROM games").fetchone()[0]
+            for record in records:
+                game_id += 1
+                board = record.board
+                board_id = self.board_id(board, create=True)
+                jump_table = board.jump_table
+                positions = [0] * record.num_players
+                winner = None
+                turn = -1
+                for turn, roll in enumerate(record.rolls):
+                    if not 1 <= roll <= DICE_SIDES:
+                        raise ValueError(f"invalid roll {roll}")
+                    seat = turn % record.num_players
+                    landing = positions[seat] + roll
+                    if landing <= board.size:
+                        position = jump_table[landing]
+                        if position != landing:
+                            jumps.append((board_id, landing, position, game_id, turn))
+                        positions[seat] = position
+                    turns.append((game_id, turn, seat, roll, positions[seat]))
+                    if positions[seat] == board.size:
+                        winner = seat
+                        break
+                games.append((game_id, board_id, record.played_at, record.source, record.num_players,
+                              turn + 1, winner))
+                if record.names is not None:
+                    players.extend((game_id, seat, board_id, name, int(seat == winner))
+                                   for seat, name in enumerate(record.names))
+
+            connection.executemany("INSERT INTO games VALUES (?, ?, ?, ?, ?, ?, ?)", games)
+            connection.executemany("INSERT INTO players VALUES (?, ?, ?, ?, ?)", players)
+            connection.executemany("INSERT INTO turns VALUES (?, ?, ?, ?, ?)", turns)
+            connection.executemany("INSERT INTO jumps VALUES (?, ?, ?, ?, ?)", jumps)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            # Ids of boards created in the rolled back transaction are gone
+            self._board_ids.clear()
+            raise
+        return len(games)
+
+    def num_games(self, board=None):
+        if board is None:
+            return self.connection.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+        return self.connection.execute("SELECT COUNT(*) FROM games WHERE board_id = ?",
+                                       (self.board_id(board),)).fetchone()[0]
+
+    def leaderboard(self, board=None, limit=10):
+        """Players with the most wins, as (name, wins, games) rows"""
+        if board is None:
+            rows = self.connection.execute(
+                "SELECT name, SUM(won) AS wins, COUNT(*) FROM players"
+                " GROUP BY name ORDER BY wins DESC, name LIMIT ?", (limit,))
+        else:
+            rows = self.connection.execute(
+                "SELECT name, SUM(won) AS wins, COUNT(*) FROM players WHERE board_id = ?"
+                " GROUP BY name ORDER BY wins DESC, name LIMIT ?", (self.board_id(board), limit))
+        return rows.fetchall()
+
+    def square_hits(self, board):
+        """How often each snake and ladder was taken on board, as (square, destination, hits)"""
+        return self.connection.execute(
+            "SELECT square, destination, COUNT(*) FROM jumps WHERE board_id = ?"
+            " GROUP BY square, destination ORDER BY square", (self.board_id(board),)).fetchall()
+
+    def length_distribution(self, board, finished_only=True):
+        """Number of games on board by total turns, as {turns: games}"""
+        query = "SELECT turns, COUNT(*) FROM games WHERE board_id = ?"
+        if finished_only:
+            query += " AND winner IS NOT NULL"
+        rows = self.connection.execute(query + " GROUP BY turns ORDER BY turns", (self.board_id(board),))
+        return dict(rows.fetchall())
+
+
+class ResultWriter:
+    """Inserts games on a background thread, batching whatever has queued up.
+
+    submit() only queues the game, so it's safe to call from the frame loop.
+    The store is opened on the writer thread, as SQLite connections can't be
+    shared between threads, but the constructor waits for it and raises if
+    it can't be opened. A later write failure prints a warning and stops
+    recording; it never reaches the caller.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.records = queue.Queue()
+        self.error = None
+        self.written = 0
+        self._opened = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="result-writer", daemon=True)
+        self.thread.start()
+        self._opened.wait()
+        if self.error is not None:
+            self.thread.join()
+            raise self.error
+
+    def submit(self, record):
+        """Queue record; returns False, dropping it, once writing has failed"""
+        if self.error is not None:
+            return False
+        self.records.put(record)
+        return True
+
+    def _run(self):
+        try:
+            store = ResultStore(self.path)
+        except Exception as e:
+            self.error = e
+            return
+        finally:
+            self._opened.set()
+        stopping = False
+        while not stopping:
+            batch = [self.records.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.records.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is self._STOP:
+                batch.pop()
+                stopping = True
+            if batch and self.error is None:
+                try:
+                    self.written += store.add_games(batch)
+                except Exception as e:
+                    self.error = e
+                    print(f"warning: can't write results to {self.path}, no longer recording: {e}",
+                          file=sys.stderr)
+        store.close()
+
+    def close(self):
+        """Wait for queued games to be written and close the store"""
+        if self.thread.is_alive():
+            self.records.put(self._STOP)
+            self.thread.join()
+
+
+def simulated_games(num_games, num_players=2, board=DEFAULT_BOARD, seed=None):
+    """Play seeded games and yield them as GameRecords with source "sim" """
+    rng = random.Random(seed)
+    for _ in range(num_games):
+        yield GameRecord(board, play_game(board, num_players, rng), num_players, source="sim")
+
+
+def add_simulated_games(store, num_games, num_players=2, board=DEFAULT_BOARD, seed=None,
+                        batch_size=DEFAULT_BATCH_SIZE):
+    """Simulate games straight into store, batch_size games per transaction"""
+    batch = []
+    for record in simulated_games(num_games, num_players, board, seed):
+        batch.append(record)
+        if len(batch) == batch_size:
+            store.add_games(batch)
+            batch = []
+    if batch:
+        store.add_games(batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and query Snake and Ladder results")
+    parser.add_argument("path", help="SQLite database file")
+    parser.add_argument("--board", help="board config JSON file (default: standard board)")
+    parser.add_argument("--simulate", type=int, default=0, metavar="GAMES", help="add simulated games")
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--leaderboard", action="store_true")
+    parser.add_argument("--hits", action="store_true", help="show how often each snake and ladder was taken")
+    parser.add_argument("--lengths", action="store_true", help="show the game length distribution")
+    args = parser.parse_args()
+
+    board = load_board(args.board) if args.board else DEFAULT_BOARD
+    with ResultStore(args.path) as store:
+        if args.simulate:
+            start = time.perf_counter()
+            add_simulated_games(store, args.simulate, args.players, board, args.seed)
+            elapsed = time.perf_counter() - start
+            print(f"added {args.simulate} games in {elapsed:.1f}s ({args.simulate / elapsed:.0f} games/sec)")
+
+        print(f"games on board: {store.num_games(board)} (all boards: {store.num_games()})")
+        if args.leaderboard:
+            for name, wins, games in store.leaderboard(board):
+                print(f"{name}: {wins} wins in {games} games")
+        if args.hits:
+            for square, destination, hits in store.square_hits(board):
+                kind = "ladder" if destination > square else "snake"
+                print(f"{kind} {square}->{destination}: {hits}")
+        if args.lengths:
+            for turns, games in store.length_distribution(board).items():
+                print(f"{turns}: {games}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Parallel Snake and Ladder tournaments.
+
+A tournament plays every combination of board x player count x seed. Each
+combination (a "cell") is simulated in a worker process with its own RNG
+stream, derived only from the base seed and the cell itself, so results are
+bit-identical no matter how many workers are used or in which order cells
+finish. Cell results stream back as they complete and are merged into
+running totals.
+"""
+import argparse
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from snake_and_ladder_rules import DEFAULT_BOARD, load_board
+from snake_and_ladder_sim import derive_seed, simulate_games
+
+
+def _play_cell(board, num_players, num_games, seed):
+    return simulate_games(num_games, num_players, board=board, seed=seed)
+
+
+class StandingTotals:
+    """Running totals for one (board, player count) pair.
+
+    Only integer sums are kept, so merging is exact and order-independent.
+    """
+
+    def __init__(self, num_players):
+        self.num_players = num_players
+        self.games = 0
+        self.win_counts = [0] * num_players
+        self.length_sum = 0
+        self.length_sq_sum = 0
+        self.length_histogram = Counter()
+
+    def merge(self, result):
+        self.games += result.num_games
+        for seat, count in enumerate(result.win_counts()):
+            self.win_counts[seat] += count
+        histogram = result.length_histogram()
+        self.length_histogram.update(histogram)
+        for length, count in histogram.items():
+            self.length_sum += length * count
+            self.length_sq_sum += length * length * count
+
+    def mean_length(self):
+        return self.length_sum / self.games
+
+    def length_stddev(self):
+        mean = self.mean_length()
+        return max(self.length_sq_sum / self.games - mean * mean, 0.0) ** 0.5
+
+    def win_rates(self):
+        return [count / self.games for count in self.win_counts]
+
+    def summary(self):
+        return {
+            "games": self.games,
+            "mean_length": self.mean_length(),
+            "stddev_length": self.length_stddev(),
+            "win_rates": self.win_rates(),
+        }
+
+
+def iter_tournament(boards, player_counts, num_seeds, games_per_seed, base_seed=0, workers=None):
+    """Run the tournament and yield (board_name, num_players, seed_index, result)
+    for each cell as soon as it finishes.
+
+    boards maps a name to a Board. workers defaults to the number of CPUs.
+    """
+    cells = [
+        (name, board, num_players, seed_index)
+        for name, board in boards.items()
+        for num_players in player_counts
+        for seed_index in range(num_seeds)
+    ]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for name, board, num_players, seed_index in cells:
+            seed = derive_seed(base_seed, board.key(), num_players, seed_index)
+            future = executor.submit(_play_cell, board, num_players, games_per_seed, seed)
+            futures[future] = (name, num_players, seed_index)
+
+        for future in as_completed(futures):
+            name, num_players, seed_index = futures[future]
+            yield name, num_players, seed_index, future.result()
+
+
+def run_tournament(boards, player_counts, num_seeds, games_per_seed, base_seed=0, workers=None,
+                   on_result=None):
+    """Run the tournament and return {(board_name, num_players): StandingTotals}.
+
+    on_result, if given, is called with each cell's result as it arrives.
+    """
+    standings = {}
+    for name, num_players, seed_index, result in iter_tournament(
+            boards, player_counts, num_seeds, games_per_seed, base_seed, workers):
+        key = (name, num_players)
+        if key not in standings:
+            standings[key] = StandingTotals(num_players)
+        standings[key].merge(result)
+        if on_result is not None:
+            on_result(name, num_players, seed_index, result)
+    return standings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a parallel Snake and Ladder tournament")
+    parser.add_argument("--players", type=int, nargs="+", default=[2, 3, 4])
+    parser.add_argument("--seeds", type=int, default=16)
+    parser.add_argument("--games-per-seed", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--boards", nargs="+", help="board config JSON files (default: standard board)")
+    args = parser.parse_args()
+
+    if args.boards:
+        boards = {os.path.splitext(os.path.basename(path))[0]: load_board(path) for path in args.boards}
+    else:
+        boards = {"standard": DEFAULT_BOARD}
+
+    start = time.perf_counter()
+    standings = run_tournament(boards, args.players, args.seeds,
+                               args.games_per_seed, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+
+    total_games = 0
+    for (name, num_players), totals in sorted(standings.items()):
+        print(f"{name} / {num_players} players: {totals.summary()}")
+        total_games += totals.games
+    print(f"games/sec: {total_games / elapsed:.0f} ({args.workers} workers)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Exact board statistics against seeded Monte Carlo runs"""
+import math
+
+import pytest
+
+from snake_and_ladder_analytics import _turn_distribution, analyze_board
+from snake_and_ladder_rules import DEFAULT_BOARD
+from snake_and_ladder_sim import simulate_games_vectorized
+
+GAMES = 200000
+STANDARD_ERRORS = 4  # A seeded run this far off means the solve is wrong
+
+
+@pytest.mark.parametrize("num_players", [2, 3])
+def test_matches_simulation(num_players):
+    analysis = analyze_board(DEFAULT_BOARD, num_players)
+    result = simulate_games_vectorized(GAMES, num_players, seed=num_players)
+
+    mean_error = analysis.game_length_stddev / math.sqrt(GAMES)
+    assert abs(result.mean_length() - analysis.expected_game_length) < STANDARD_ERRORS * mean_error
+
+    assert math.isclose(analysis.win_probabilities.sum(), 1.0, abs_tol=1e-9)
+    for rate, probability in zip(result.win_rates(), analysis.win_probabilities):
+        rate_error = math.sqrt(probability * (1 - probability) / GAMES)
+        assert abs(rate - probability) < STANDARD_ERRORS * rate_error
+
+
+def test_memoized_arrays_are_read_only():
+    analysis = analyze_board(DEFAULT_BOARD, 2)
+    for array in (analysis.turn_distribution, analysis.win_probabilities, analysis.length_distribution):
+        assert not array.flags.writeable
+        with pytest.raises(ValueError):
+            array[0] = 1.0
+
+
+def test_repeat_call_reuses_cache():
+    first = analyze_board(DEFAULT_BOARD, 2)
+    hits = _turn_distribution.cache_info().hits
+    second = analyze_board(DEFAULT_BOARD, 2)
+
+    assert _turn_distribution.cache_info().hits > hits
+    assert second.turn_distribution is first.turn_distribution
+    assert second.length_distribution is first.length_distribution
@@ -0,0 +1,31 @@
+"""Saving replays from the game"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import snake_and_ladder_modern as game  # noqa: E402
+
+
+def finished_game():
+    players = [game.Player(game.RED, "Player 1", 0), game.Player(game.BLUE, "Player 2", 1)]
+    for roll in (6, 6, 6, 6):
+        players[0].dice_history.append(roll)
+        players[1].dice_history.append(1)
+    return players
+
+
+def test_saves_games_ending_in_the_same_second(tmp_path, monkeypatch):
+    monkeypatch.setattr(game, "REPLAY_DIR", str(tmp_path))
+    paths = [game.save_replay(finished_game()) for _ in range(3)]
+    assert len(set(paths)) == 3
+    assert all(os.path.exists(path) for path in paths)
+
+
+def test_unwritable_replay_dir_turns_saving_off(tmp_path, monkeypatch, capsys):
+    not_a_dir = tmp_path / "file"
+    not_a_dir.write_text("")
+    monkeypatch.setattr(game, "REPLAY_DIR", str(not_a_dir))
+
+    assert game.save_replay(finished_game()) is None
+    assert game.REPLAY_DIR is None
+    assert "can't save replays" in capsys.readouterr().err
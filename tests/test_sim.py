@@ -0,0 +1,20 @@
+"""Batch simulators on boards and player counts beyond the usual"""
+import pytest
+
+from snake_and_ladder_rules import Board
+from snake_and_ladder_sim import np, simulate_games_vectorized
+
+pytestmark = pytest.mark.skipif(np is None, reason="needs NumPy")
+
+
+def test_vectorized_large_board():
+    board = Board({}, {}, 40000)
+    result = simulate_games_vectorized(10, 2, board, seed=1)
+    # Every turn moves at most DICE_SIDES squares
+    assert result.lengths.min() >= 2 * (40000 // 6) - 1
+
+
+def test_vectorized_many_players():
+    result = simulate_games_vectorized(200, 200, seed=1)
+    assert result.winners.max() < 200
+    assert sum(result.win_counts()) == 200